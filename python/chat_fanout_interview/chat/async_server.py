@@ -0,0 +1,94 @@
+"""Asyncio-driven chat server with one delivery task per user."""
+
+import asyncio
+from typing import Dict, Iterable
+from .models import Message
+from .server import ChatServer
+from .transport import Transport
+
+
+class AsyncChatServer(ChatServer):
+    """Chat server that delivers through per-user asyncio queues.
+    
+    Broadcasting only calls put_nowait() on each recipient's queue; a
+    dedicated consumer task per user retries transport.send() and sleeps
+    until the next tick whenever the transport is not ready. Must be used
+    from inside a running event loop.
+    """
+    
+    def __init__(self, transport: Transport, buffer_size: int = 3):
+        """Initialize async chat server.
+        
+        Args:
+            transport: Transport for message delivery
+            buffer_size: Maximum number of queued messages per user
+        """
+        super().__init__(transport, buffer_size)
+        self._queues: Dict[str, asyncio.Queue] = {}
+        self._workers: Dict[str, asyncio.Task] = {}
+        self._ticked = asyncio.Event()
+        
+    def _queue_for(self, user_id: str) -> asyncio.Queue:
+        """Get a user's queue, starting its delivery task on first use."""
+        queue = self._queues.get(user_id)
+        if queue is None:
+            queue = self._queues[user_id] = asyncio.Queue(maxsize=self.buffer_size)
+            self._workers[user_id] = asyncio.create_task(self._deliver(user_id, queue))
+        return queue
+        
+    async def _deliver(self, user_id: str, queue: asyncio.Queue):
+        """Deliver a user's messages in order, waiting a tick on refusal."""
+        send = self.transport.send
+        while True:
+            message = await queue.get()
+            while not send(user_id, message):
+                await self._ticked.wait()
+            queue.task_done()
+            if queue.empty():
+                self._pending.discard(user_id)
+            
+    def enqueue(self, user_id: str, message: Message):
+        """Queue a message for a user without blocking.
+        
+        A full queue evicts its oldest message and counts it as dropped.
+        
+        Args:
+            user_id: Target user identifier
+            message: Message to deliver
+        """
+        queue = self._queue_for(user_id)
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            self._dropped[user_id] += 1
+        queue.put_nowait(message)
+        self._pending.add(user_id)
+        
+    def enqueue_many(self, user_ids: Iterable[str], message: Message):
+        """Queue one message for several users without blocking.
+        
+        Args:
+            user_ids: Target user identifiers
+            message: Message to deliver
+        """
+        for user_id in user_ids:
+            self.enqueue(user_id, message)
+            
+    def tick(self):
+        """Advance server state by one tick.
+        
+        Wakes every delivery task waiting on a refused send; they retry
+        the next time the event loop runs.
+        """
+        self.clock.tick()
+        self._ticked.set()
+        self._ticked.clear()
+        
+    async def aclose(self):
+        """Cancel all delivery tasks and wait for them to finish."""
+        workers = list(self._workers.values())
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._workers.clear()
+        self._queues.clear()
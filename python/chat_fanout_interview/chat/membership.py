@@ -1,17 +1,22 @@
 """Room membership management."""
 
-from typing import Set, Dict
+from typing import Set, Dict, Tuple
 
 
 class RoomMembershipStore:
     """Manages which users are in which rooms.
     
-    Naive dictionary-based implementation.
+    Each room's members are kept as the keys of a dict rather than a set.
+    A dict stores its entries in a dense, insertion-ordered array behind an
+    open-addressed index, so iterating a room walks contiguous memory while
+    membership checks stay O(1).
     """
     
     def __init__(self):
         """Initialize membership store."""
-        self._memberships: Dict[str, Set[str]] = {}
+        self._memberships: Dict[str, Dict[str, None]] = {}
+        self._user_rooms: Dict[str, Set[str]] = {}  # inverse index: user -> rooms
+        self._snapshots: Dict[str, Tuple[str, ...]] = {}  # cached iter_users results
         
     def add_user(self, room_id: str, user_id: str):
         """Add a user to a room.
@@ -21,8 +26,10 @@ class RoomMembershipStore:
             user_id: User identifier
         """
         if room_id not in self._memberships:
-            self._memberships[room_id] = set()
-        self._memberships[room_id].add(user_id)
+            self._memberships[room_id] = {}
+        self._memberships[room_id][user_id] = None
+        self._snapshots.pop(room_id, None)
+        self._user_rooms.setdefault(user_id, set()).add(room_id)
         
     def remove_user(self, room_id: str, user_id: str):
         """Remove a user from a room.
@@ -32,8 +39,14 @@ class RoomMembershipStore:
             user_id: User identifier
         """
         if room_id in self._memberships:
-            self._memberships[room_id].discard(user_id)
-            
+            self._memberships[room_id].pop(user_id, None)
+            self._snapshots.pop(room_id, None)
+        rooms = self._user_rooms.get(user_id)
+        if rooms is not None:
+            rooms.discard(room_id)
+            if not rooms:
+                del self._user_rooms[user_id]
+                
     def list_users(self, room_id: str) -> Set[str]:
         """List all users in a room.
         
@@ -43,4 +56,32 @@ class RoomMembershipStore:
         Returns:
             Set of user identifiers in the room
         """
-        return self._memberships.get(room_id, set()).copy()
+        return set(self._memberships.get(room_id, ()))
+        
+    def iter_users(self, room_id: str) -> Tuple[str, ...]:
+        """Get an immutable snapshot of the users in a room.
+        
+        The snapshot is cached until the room's membership changes, so
+        repeated broadcasts to the same room do not copy the member set.
+        
+        Args:
+            room_id: Room identifier
+            
+        Returns:
+            Tuple of user identifiers in the room
+        """
+        users = self._snapshots.get(room_id)
+        if users is None:
+            users = self._snapshots[room_id] = tuple(self._memberships.get(room_id, ()))
+        return users
+        
+    def list_rooms(self, user_id: str) -> Set[str]:
+        """List all rooms a user belongs to.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Set of room identifiers the user is in
+        """
+        return self._user_rooms.get(user_id, set()).copy()
@@ -3,18 +3,18 @@
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     """Represents a chat message.
     
     Attributes:
-        id: Unique message identifier
+        id: Unique message identifier (monotonic integer)
         room_id: Room where the message was sent
         user_id: User who sent the message
         text: Message content
         seq: Sequence number for ordering
     """
-    id: str
+    id: int
     room_id: str
     user_id: str
     text: str
@@ -1,5 +1,6 @@
 """Chat room implementation."""
 
+from typing import Callable, Iterable
 from .models import Message
 from .transport import Transport
 from .membership import RoomMembershipStore
@@ -8,35 +9,39 @@ from .membership import RoomMembershipStore
 class ChatRoom:
     """Represents a chat room that can broadcast messages to users.
     
-    Naive implementation: broadcast() loops over users synchronously.
-    This will block on slow users.
+    Broadcasting hands each message to an enqueue callback that buffers
+    it per user, so a slow user never blocks delivery to the rest of the room.
     """
     
-    def __init__(self, room_id: str, membership: RoomMembershipStore, transport: Transport):
+    def __init__(
+        self,
+        room_id: str,
+        membership: RoomMembershipStore,
+        transport: Transport,
+        enqueue_many: Callable[[Iterable[str], Message], None],
+    ):
         """Initialize chat room.
         
         Args:
             room_id: Room identifier
             membership: Membership store to get room users
             transport: Transport for sending messages
+            enqueue_many: Callback that buffers a message for several users
         """
         self.room_id = room_id
         self.membership = membership
         self.transport = transport
+        self._enqueue_many = enqueue_many
         
     def broadcast(self, message: Message):
         """Broadcast a message to all users in the room.
         
-        TODO: This naive implementation loops over users synchronously
-        and calls transport.send() for each user. This will block if any
-        user is slow. Need to refactor to use per-user buffers and
-        worker queues for non-blocking delivery.
+        Each user gets the message through their own outgoing buffer;
+        undelivered messages are drained later by ChatServer.tick().
         
         Args:
             message: Message to broadcast
         """
-        users = self.membership.list_users(self.room_id)
+        users = self.membership.iter_users(self.room_id)
         
-        # Naive blocking implementation
-        for user_id in users:
-            self.transport.send(user_id, message)
+        self._enqueue_many(users, message)
@@ -1,8 +1,10 @@
 """Chat server coordinating rooms, membership, and transport."""
 
-from typing import Dict
+from collections import Counter, deque
+from typing import Deque, Dict, Iterable, List, Set
 from .room import ChatRoom
 from .membership import RoomMembershipStore
+from .models import Message
 from .transport import Transport
 from .clock import Clock
 
@@ -10,20 +12,26 @@ from .clock import Clock
 class ChatServer:
     """Main chat server coordinating rooms, membership, and message transport.
     
-    Uses tick-based simulation for deterministic progress.
+    Uses tick-based simulation for deterministic progress. Each user has a
+    bounded outgoing buffer; when it is full the oldest message is dropped.
     """
     
-    def __init__(self, transport: Transport):
+    def __init__(self, transport: Transport, buffer_size: int = 3):
         """Initialize chat server.
         
         Args:
             transport: Transport for message delivery
+            buffer_size: Maximum number of pending messages per user
         """
         self.transport = transport
         self.membership = RoomMembershipStore()
         self.rooms: Dict[str, ChatRoom] = {}
         self.clock = Clock()
+        self.buffer_size = buffer_size
         self._message_counter = 0
+        self._buffers: Dict[str, Deque[Message]] = {}
+        self._dropped: Counter = Counter()
+        self._pending: Set[str] = set()  # users with a non-empty buffer
         
     def get_or_create_room(self, room_id: str) -> ChatRoom:
         """Get existing room or create new one.
@@ -35,7 +43,7 @@ class ChatServer:
             ChatRoom instance
         """
         if room_id not in self.rooms:
-            self.rooms[room_id] = ChatRoom(room_id, self.membership, self.transport)
+            self.rooms[room_id] = ChatRoom(room_id, self.membership, self.transport, self.enqueue_many)
         return self.rooms[room_id]
         
     def join_room(self, room_id: str, user_id: str):
@@ -56,26 +64,109 @@ class ChatServer:
         """
         self.membership.remove_user(room_id, user_id)
         
-    def next_message_id(self) -> str:
-        """Generate next message ID."""
+    def next_message_id(self) -> int:
+        """Generate next message ID.
+        
+        IDs are plain ints; format them (e.g. f'msg_{id}') only at the edge
+        where a string is actually needed.
+        """
         self._message_counter += 1
-        return f'msg_{self._message_counter}'
+        return self._message_counter
+        
+    def _buffer_for(self, user_id: str) -> Deque[Message]:
+        """Get a user's outgoing buffer, creating it on first use."""
+        buf = self._buffers.get(user_id)
+        if buf is None:
+            buf = self._buffers[user_id] = deque(maxlen=self.buffer_size)
+        return buf
+        
+    def _append(self, user_id: str, buf: Deque[Message], message: Message):
+        """Append to a user's buffer, counting the evicted message if full."""
+        if len(buf) == buf.maxlen:
+            self._dropped[user_id] += 1
+        buf.append(message)
+        self._pending.add(user_id)
+        
+    def enqueue(self, user_id: str, message: Message):
+        """Queue a message for a user without blocking.
+        
+        If the user has nothing pending, delivery is attempted immediately.
+        Otherwise the message is appended to the user's buffer; a full
+        buffer evicts its oldest message and counts it as dropped.
+        
+        Args:
+            user_id: Target user identifier
+            message: Message to deliver
+        """
+        buf = self._buffer_for(user_id)
+        if not buf and self.transport.send(user_id, message):
+            return
+        self._append(user_id, buf, message)
+        
+    def enqueue_many(self, user_ids: Iterable[str], message: Message):
+        """Queue one message for several users without blocking.
+        
+        Users with nothing pending are sent the message in a single
+        transport.send_many() call; everyone else, and anyone the
+        transport refuses, gets it buffered as in enqueue().
+        
+        Args:
+            user_ids: Target user identifiers
+            message: Message to deliver
+        """
+        idle: List[str] = []
+        # Bind hot-path methods once rather than per recipient
+        buffer_for = self._buffer_for
+        append = self._append
+        mark_idle = idle.append
+        for user_id in user_ids:
+            buf = buffer_for(user_id)
+            if buf:
+                append(user_id, buf, message)
+            else:
+                mark_idle(user_id)
+        if not idle:
+            return
+        accepted = self.transport.send_many(idle, message)
+        buffers = self._buffers
+        for user_id, ok in zip(idle, accepted):
+            if not ok:
+                append(user_id, buffers[user_id], message)
+                
+    def get_dropped_count(self, user_id: str) -> int:
+        """Get the number of messages dropped for a user.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Number of messages evicted from the user's buffer
+        """
+        return self._dropped[user_id]
+        
+    def has_pending(self) -> bool:
+        """Check whether any user has buffered messages awaiting delivery."""
+        return bool(self._pending)
         
     def tick(self):
         """Advance server state by one tick.
         
-        TODO: This should drive worker queues to process pending
-        message deliveries. Currently does nothing because the naive
-        implementation in ChatRoom.broadcast() is synchronous.
-        
-        Need to implement:
-        - Per-user outgoing message buffers
-        - Worker queue system to process buffered messages
-        - Proper integration with transport layer
+        Drains the buffer of each user with pending messages from the head
+        until the transport refuses a send, so a backed-up user with spare
+        transport capacity catches up in one tick instead of one message
+        per tick. Users with empty buffers are not visited. A message is
+        only removed once the transport accepts it, so per-user ordering
+        is preserved.
         """
         self.clock.tick()
         
-        # TODO: Process worker queues here
-        # Should attempt to deliver buffered messages for each user
-        # Should respect transport.send() return value (True/False)
-        # Should handle buffer overflow with drop policy
+        if not self._pending:
+            return
+        send = self.transport.send
+        buffers = self._buffers
+        for user_id in list(self._pending):
+            buf = buffers[user_id]
+            while buf and send(user_id, buf[0]):
+                buf.popleft()
+            if not buf:
+                self._pending.discard(user_id)
@@ -1,7 +1,9 @@
 """Transport layer abstraction for message delivery."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List
+from array import array
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, List, Tuple
 from .models import Message
 
 
@@ -20,6 +22,22 @@ class Transport(ABC):
             True if message was accepted, False if transport is not ready
         """
         pass
+        
+    def send_many(self, user_ids: Iterable[str], message: Message) -> List[bool]:
+        """Send one message to several users.
+        
+        The default implementation calls send() per user; transports that
+        can amortize per-recipient work should override it.
+        
+        Args:
+            user_ids: Target user identifiers
+            message: Message to send
+            
+        Returns:
+            One acceptance flag per user, in the order given
+        """
+        send = self.send
+        return [send(user_id, message) for user_id in user_ids]
 
 
 class SlowTransport(Transport):
@@ -35,35 +53,38 @@ class SlowTransport(Transport):
             ticks_per_send: Number of ticks required before accepting next send
         """
         self.ticks_per_send = ticks_per_send
-        self._user_ticks: Dict[str, int] = {}  # tracks ticks until ready per user
-        self._delivered: Dict[str, List[Message]] = {}  # stores delivered messages
+        self._now = 0  # ticks elapsed since creation
+        self._ready_at: Dict[str, int] = {}  # tick at which each user accepts the next send
+        self._delivered: DefaultDict[str, List[Message]] = defaultdict(list)  # stores delivered messages
         
     def send(self, user_id: str, message: Message) -> bool:
         """Attempt to send a message to a user.
         
         Returns True only if the required ticks have passed since the last send.
         """
-        ticks_remaining = self._user_ticks.get(user_id, 0)
-        
-        if ticks_remaining > 0:
+        ready_at = self._ready_at.get(user_id)
+        if ready_at is None:
+            # A slow user must wait ticks_per_send ticks before every send,
+            # including the first one.
+            ready_at = self._ready_at[user_id] = self._now + self.ticks_per_send
+            
+        if self._now < ready_at:
             return False  # not ready yet
             
-        # Accept the message
-        if user_id not in self._delivered:
-            self._delivered[user_id] = []
+        # Accept the message and set the tick when the next send is allowed
         self._delivered[user_id].append(message)
-        
-        # Set ticks until ready for next send
-        self._user_ticks[user_id] = self.ticks_per_send
+        self._ready_at[user_id] = self._now + self.ticks_per_send
         
         return True
         
     def tick(self):
-        """Advance simulation by one tick."""
-        for user_id in self._user_ticks:
-            if self._user_ticks[user_id] > 0:
-                self._user_ticks[user_id] -= 1
-                
+        """Advance simulation by one tick.
+        
+        Readiness is stored as an absolute tick, so no per-user countdown
+        has to be updated here.
+        """
+        self._now += 1
+        
     def get_delivered(self, user_id: str) -> List[Message]:
         """Get all delivered messages for a user."""
         return self._delivered.get(user_id, [])
@@ -72,20 +93,67 @@ class SlowTransport(Transport):
 class InMemoryTransport(Transport):
     """Transport that immediately stores delivered messages per user.
     
-    Always accepts messages (simulates fast users).
+    Always accepts messages (simulates fast users). Deliveries are stored
+    column-wise: every user has a packed array of seq values and a packed
+    array of indexes into one shared message list, so a broadcast stores
+    each Message once and per-user seq scans touch contiguous ints.
     """
     
     def __init__(self):
         """Initialize in-memory transport."""
-        self._delivered: Dict[str, List[Message]] = {}
+        self._messages: List[Message] = []
+        self._columns: Dict[str, Tuple[array, array]] = {}  # user -> (message refs, seqs)
+        
+    def _ref(self, message: Message) -> int:
+        """Get the shared-list index for a message, storing it if new.
+        
+        Broadcasts deliver the same message to users back to back, so
+        comparing with the last stored message is enough to share it.
+        """
+        messages = self._messages
+        if not messages or messages[-1] is not message:
+            messages.append(message)
+        return len(messages) - 1
+        
+    def _columns_for(self, user_id: str) -> Tuple[array, array]:
+        """Get a user's (message refs, seqs) columns, creating them on first use."""
+        columns = self._columns.get(user_id)
+        if columns is None:
+            columns = self._columns[user_id] = (array('q'), array('q'))
+        return columns
         
     def send(self, user_id: str, message: Message) -> bool:
         """Send a message to a user (always succeeds immediately)."""
-        if user_id not in self._delivered:
-            self._delivered[user_id] = []
-        self._delivered[user_id].append(message)
+        refs, seqs = self._columns_for(user_id)
+        refs.append(self._ref(message))
+        seqs.append(message.seq)
         return True
         
+    def send_many(self, user_ids: Iterable[str], message: Message) -> List[bool]:
+        """Send a message to several users (always succeeds immediately)."""
+        if type(self).send is not InMemoryTransport.send:
+            # Subclasses that customise send() must still see every message
+            return super().send_many(user_ids, message)
+        ref = self._ref(message)
+        seq = message.seq
+        columns_for = self._columns_for
+        accepted = []
+        for user_id in user_ids:
+            refs, seqs = columns_for(user_id)
+            refs.append(ref)
+            seqs.append(seq)
+            accepted.append(True)
+        return accepted
+        
     def get_delivered(self, user_id: str) -> List[Message]:
         """Get all delivered messages for a user."""
-        return self._delivered.get(user_id, [])
+        columns = self._columns.get(user_id)
+        if columns is None:
+            return []
+        messages = self._messages
+        return [messages[ref] for ref in columns[0]]
+        
+    def get_delivered_seqs(self, user_id: str) -> array:
+        """Get the seq values of a user's delivered messages, in delivery order."""
+        columns = self._columns.get(user_id)
+        return columns[1] if columns is not None else array('q')
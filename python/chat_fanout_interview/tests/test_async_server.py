@@ -0,0 +1,45 @@
+"""Test the asyncio-driven chat server."""
+
+import asyncio
+
+from chat.async_server import AsyncChatServer
+from chat.transport import SlowTransport
+from chat.models import Message
+
+
+def test_async_server_drops_oldest_and_preserves_order():
+    """Queued messages beyond the buffer size evict the oldest ones.
+    
+    Delivery tasks only run when the event loop gets control, so all
+    broadcasts land in the queue before anything is sent.
+    """
+    async def scenario():
+        transport = SlowTransport(ticks_per_send=2)
+        server = AsyncChatServer(transport)
+        
+        server.join_room('room1', 'slow_user')
+        room = server.get_or_create_room('room1')
+        
+        for seq in range(10):
+            msg = Message(
+                id=server.next_message_id(),
+                room_id='room1',
+                user_id='sender',
+                text=f'Message {seq}',
+                seq=seq
+            )
+            room.broadcast(msg)
+            
+        for _ in range(20):
+            server.tick()
+            transport.tick()
+            await asyncio.sleep(0)
+            
+        await server.aclose()
+        return server, transport
+        
+    server, transport = asyncio.run(scenario())
+    
+    seq_values = [msg.seq for msg in transport.get_delivered('slow_user')]
+    assert seq_values == [7, 8, 9], f'Expected last 3 messages, got {seq_values}'
+    assert server.get_dropped_count('slow_user') == 7
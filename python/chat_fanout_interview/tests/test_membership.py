@@ -0,0 +1,43 @@
+"""Test room membership, including the user -> rooms inverse index."""
+
+from chat.membership import RoomMembershipStore
+
+
+def test_list_rooms_follows_joins_and_leaves():
+    """list_rooms() reflects every join and leave for a user.
+    
+    Leaving a user's last room removes the user from the inverse index
+    entirely rather than leaving an empty set behind.
+    """
+    store = RoomMembershipStore()
+    assert store.list_rooms('user1') == set()
+    
+    store.add_user('room1', 'user1')
+    store.add_user('room2', 'user1')
+    store.add_user('room1', 'user2')
+    assert store.list_rooms('user1') == {'room1', 'room2'}
+    assert store.list_rooms('user2') == {'room1'}
+    
+    store.remove_user('room1', 'user1')
+    assert store.list_rooms('user1') == {'room2'}
+    assert store.list_users('room1') == {'user2'}
+    
+    # Leaving the last room drops the user's entry
+    store.remove_user('room2', 'user1')
+    assert store.list_rooms('user1') == set()
+    assert 'user1' not in store._user_rooms, 'no empty room set should be left behind'
+    
+    # Leaving a room the user isn't in is a no-op
+    store.remove_user('room3', 'user2')
+    assert store.list_rooms('user2') == {'room1'}
+
+
+def test_list_rooms_returns_a_copy():
+    """Changing the set returned by list_rooms() does not change membership."""
+    store = RoomMembershipStore()
+    store.add_user('room1', 'user1')
+    
+    rooms = store.list_rooms('user1')
+    rooms.add('room2')
+    
+    assert store.list_rooms('user1') == {'room1'}
@@ -79,3 +79,27 @@ def test_ordering_with_slow_users():
     # Should be consecutive
     for i in range(len(seq_values) - 1):
         assert seq_values[i + 1] == seq_values[i] + 1, f'Gap in sequence at {i}: {seq_values}'
+
+
+def test_get_delivered_seqs_matches_delivered_messages():
+    """get_delivered_seqs() mirrors get_delivered() for send() and send_many() alike."""
+    transport = InMemoryTransport()
+    assert list(transport.get_delivered_seqs('user1')) == []
+    
+    messages = [
+        Message(id=seq, room_id='room1', user_id='sender', text=f'Message {seq}', seq=seq)
+        for seq in range(6)
+    ]
+    for msg in messages[:3]:
+        assert transport.send('user1', msg)
+    for msg in messages[3:]:
+        assert transport.send_many(['user1', 'user2'], msg) == [True, True]
+    
+    for user_id, expected in [('user1', [0, 1, 2, 3, 4, 5]), ('user2', [3, 4, 5])]:
+        delivered = transport.get_delivered(user_id)
+        seqs = transport.get_delivered_seqs(user_id)
+        assert list(seqs) == expected
+        assert list(seqs) == [msg.seq for msg in delivered]
+    
+    # A broadcast delivers each message object once, shared by every recipient
+    assert transport.get_delivered('user1')[3] is transport.get_delivered('user2')[0]
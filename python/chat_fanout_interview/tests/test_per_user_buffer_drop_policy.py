@@ -76,3 +76,19 @@ def test_drop_counter_tracks_dropped_messages():
     assert hasattr(server, 'get_dropped_count'), 'Server should have get_dropped_count method'
     dropped = server.get_dropped_count('slow_user')
     assert dropped == 7, f'Expected 7 dropped messages, got {dropped}'
+
+
+def test_has_pending_tracks_buffered_messages():
+    """has_pending() is True only while some user has a buffered message."""
+    transport = SlowTransport(ticks_per_send=1)
+    server = ChatServer(transport)
+    assert not server.has_pending(), 'an idle server has nothing pending'
+    
+    msg = Message(id=server.next_message_id(), room_id='room1', user_id='sender', text='Hi', seq=0)
+    server.enqueue('slow_user', msg)
+    assert server.has_pending(), 'a refused send should be buffered'
+    
+    transport.tick()
+    server.tick()
+    assert transport.get_delivered('slow_user') == [msg]
+    assert not server.has_pending(), 'tick() should drain the buffer and clear pending'
@@ -1,29 +1,75 @@
 '''Fake HTTP fetcher for simulating network requests without actual I/O.'''
-from typing import Dict, Tuple
-from urllib.parse import urlparse
+import threading
+from collections import Counter
+from typing import Callable, Dict, Mapping, Optional, Tuple, Union
+
+
+def extract_domain(url: str) -> str:
+    '''Extract the domain (netloc) from a URL without building a ParseResult.
+    
+    Equivalent to urlparse(url).netloc, falling back to the first path
+    segment for scheme-less URLs like 'example.com/page'.
+    
+    Args:
+        url: URL to extract the domain from
+        
+    Returns:
+        Domain portion of the URL
+    '''
+    start = url.find('://')
+    if start >= 0:
+        start += 3
+    elif url.startswith('//'):
+        start = 2
+    else:
+        start = 0
+    end = len(url)
+    for sep in '/?#':
+        idx = url.find(sep, start, end)
+        if idx >= 0:
+            end = idx
+    return url[start:end]
 
 
 class FakeFetcher:
-    '''Simulates HTTP fetching with configurable per-domain failures and latency.'''
+    '''Simulates HTTP fetching with configurable per-domain failures and latency.
+    
+    fetch() may be called from several threads at once; the counters are
+    updated under a lock so failures stay deterministic.
+    '''
     
     def __init__(
         self,
-        html_bodies: Dict[str, str],
+        html_bodies: Union[Mapping[str, str], Callable[[str, float], str]],
         domain_latency: Dict[str, float] = None,
         domain_failure_rate: Dict[str, float] = None
     ):
         '''Initialize the fake fetcher.
         
         Args:
-            html_bodies: Mapping of URL to HTML content
+            html_bodies: Mapping of URL to HTML content, or a callable
+                building the body from (url, now) on demand so large test
+                crawls need not materialize every page up front
             domain_latency: Per-domain simulated latency in seconds
             domain_failure_rate: Per-domain failure probability (0.0 to 1.0)
         '''
-        self._html_bodies = html_bodies
+        if isinstance(html_bodies, Mapping):
+            self._html_bodies = html_bodies
+            self._body_factory: Optional[Callable[[str, float], str]] = None
+        else:
+            self._html_bodies = {}
+            self._body_factory = html_bodies
         self._domain_latency = domain_latency or {}
         self._domain_failure_rate = domain_failure_rate or {}
+        # Every Nth fetch of a domain fails; N is fixed, so compute it once
+        self._domain_failure_period: Dict[str, int] = {
+            domain: max(1, int(1 / rate))
+            for domain, rate in self._domain_failure_rate.items()
+            if rate > 0
+        }
         self._fetch_counter = 0
-        self._per_domain_counters: Dict[str, int] = {}
+        self._per_domain_counters: Counter = Counter()
+        self._lock = threading.Lock()
     
     def fetch(self, url: str, now: float) -> str:
         '''Fetch HTML content for the given URL.
@@ -41,23 +87,43 @@ class FakeFetcher:
         Raises:
             ValueError: If fetch fails (simulated failure)
         '''
-        self._fetch_counter += 1
-        
         # Extract domain
-        parsed = urlparse(url)
-        domain = parsed.netloc or parsed.path.split('/')[0]
+        domain = extract_domain(url)
         
-        # Update per-domain counter
-        self._per_domain_counters[domain] = self._per_domain_counters.get(domain, 0) + 1
+        # Update counters together so concurrent fetches never lose a count
+        with self._lock:
+            self._fetch_counter += 1
+            self._per_domain_counters[domain] += 1
+            domain_count = self._per_domain_counters[domain]
         
         # Simulate failure based on counter (deterministic)
-        failure_rate = self._domain_failure_rate.get(domain, 0.0)
-        if failure_rate > 0 and self._per_domain_counters[domain] % int(1 / failure_rate) == 0:
+        period = self._domain_failure_period.get(domain)
+        if period is not None and domain_count % period == 0:
             raise ValueError(f'Simulated fetch failure for {url}')
         
         # Return HTML body (latency is tracked via counter, not actual sleep)
+        if self._body_factory is not None:
+            return self._body_factory(url, now)
         return self._html_bodies.get(url, f'<html><head><title>Page {url}</title></head><body>Content</body></html>')
     
+    async def fetch_async(self, url: str, now: float) -> str:
+        '''Fetch HTML content without blocking the event loop.
+        
+        The fake fetch does no real I/O, so this simply runs fetch(); a real
+        fetcher would await its HTTP client here.
+        
+        Args:
+            url: URL to fetch
+            now: Current time (from FakeClock)
+            
+        Returns:
+            HTML content as string
+            
+        Raises:
+            ValueError: If fetch fails (simulated failure)
+        '''
+        return self.fetch(url, now)
+    
     def get_fetch_count(self) -> int:
         '''Get total number of fetches performed.
         
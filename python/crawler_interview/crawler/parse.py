@@ -1,10 +1,22 @@
 '''HTML parsing and parser registry for content type routing.'''
 from dataclasses import dataclass
-from typing import Dict, Callable
+from typing import Dict, Callable, Union
+import json
 import re
 
 
-@dataclass
+# Compiled once; the window bounds the scan once '<title' is located. The
+# regexes are only the fallback for markup the plain find() path can't cut
+_TITLE_RE = re.compile(r'<title(?:\s[^>]*)?>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_TITLE_OPEN_RE = re.compile(r'<title', re.IGNORECASE)
+_TITLE_WINDOW = 4096
+
+# Bytes twins of the above, so raw response bodies are searched without decoding
+_TITLE_RE_BYTES = re.compile(rb'<title(?:\s[^>]*)?>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_TITLE_OPEN_RE_BYTES = re.compile(rb'<title', re.IGNORECASE)
+
+
+@dataclass(slots=True, frozen=True)
 class ParsedPage:
     '''Represents a parsed web page.'''
     url: str
@@ -15,19 +27,53 @@ class ParsedPage:
 class HtmlParser:
     '''Basic HTML parser that extracts title from HTML content.'''
     
-    def parse(self, html: str, url: str) -> ParsedPage:
+    def parse(self, html: Union[str, bytes], url: str) -> ParsedPage:
         '''Parse HTML content and extract title.
         
+        A bare lowercase <title>...</title> that is the page's first title
+        tag is cut out with two find() calls; tags with attributes or
+        upper/mixed-case markup fall back to a regex scan bounded to
+        _TITLE_WINDOW characters. Raw bytes are
+        searched as-is and only the title itself is decoded (as UTF-8), so
+        the body is never copied into a str.
+        
         Args:
-            html: HTML content as string
+            html: HTML content as string or bytes
             url: URL of the page
             
         Returns:
             ParsedPage with extracted information
         '''
-        # Naive title extraction using regex
-        title_match = re.search(r'<title>(.*?)</title>', html, re.IGNORECASE | re.DOTALL)
-        title = title_match.group(1).strip() if title_match else 'No title'
+        if isinstance(html, bytes):
+            title_re, title_open_re = _TITLE_RE_BYTES, _TITLE_OPEN_RE_BYTES
+            open_tag, close_tag = b'<title>', b'</title>'
+        else:
+            title_re, title_open_re = _TITLE_RE, _TITLE_OPEN_RE
+            open_tag, close_tag = '<title>', '</title>'
+        
+        title = None
+        start = html.find(open_tag)
+        # A later lowercase <title> (in an inline <svg>, say) must not win
+        # over an earlier <TITLE> or <title lang=..>: the fast path only
+        # applies when nothing before it opens a title
+        if start >= 0 and not title_open_re.search(html, 0, start):
+            body_start = start + len(open_tag)
+            end = html.find(close_tag, body_start, start + _TITLE_WINDOW)
+            if end >= 0:
+                title = html[body_start:end].strip()
+        
+        if title is None:
+            open_match = title_open_re.search(html)
+            if open_match:
+                start = open_match.start()
+                title_match = title_re.search(html, start, start + _TITLE_WINDOW)
+                if title_match:
+                    title = title_match.group(1).strip()
+        
+        if title is None:
+            title = 'No title'
+        elif isinstance(title, bytes):
+            title = title.decode('utf-8', 'replace')
         
         return ParsedPage(
             url=url,
@@ -36,45 +82,70 @@ class HtmlParser:
         )
 
 
+class JsonParser:
+    '''Parser for JSON documents that carry a top-level "title" key.'''
+    
+    def parse(self, content: Union[str, bytes], url: str) -> ParsedPage:
+        '''Parse JSON content and extract its title.
+        
+        json.loads() accepts bytes directly (detecting UTF-8/16/32), so raw
+        bodies need no separate decode pass.
+        
+        Args:
+            content: JSON content as string or bytes
+            url: URL of the content
+            
+        Returns:
+            ParsedPage with extracted information
+        '''
+        try:
+            title = json.loads(content).get('title', 'No title')
+        except (ValueError, AttributeError):
+            # ValueError covers both malformed JSON and undecodable bytes
+            title = 'Invalid JSON'
+        
+        return ParsedPage(
+            url=url,
+            title=title,
+            content_type='application/json'
+        )
+
+
 class ParserRegistry:
     '''Registry for managing parsers by content type.
     
-    TODO: Implement plugin architecture to allow registering custom parsers.
-    Currently always uses HtmlParser as a stub implementation.
+    Parsers are stored as their bound parse callables, so routing a page
+    is one dict lookup plus a call. Unregistered content types fall back
+    to HtmlParser.
     '''
     
+    __slots__ = ('_parsers', '_default_parser', '_default_parse')
+    
     def __init__(self):
         '''Initialize the parser registry.'''
-        self._parsers: Dict[str, Callable] = {}
-        # For now, always use HtmlParser (stub implementation)
+        self._parsers: Dict[str, Callable[[Union[str, bytes], str], ParsedPage]] = {}
         self._default_parser = HtmlParser()
+        self._default_parse = self._default_parser.parse
     
-    def register(self, content_type: str, parser: Callable) -> None:
+    def register(self, content_type: str, parser) -> None:
         '''Register a parser for a specific content type.
         
-        TODO: Implement this method to support plugin architecture.
-        
         Args:
             content_type: MIME type (e.g., 'application/json')
-            parser: Parser callable that takes (content, url) and returns ParsedPage
+            parser: Object with a parse(content, url) method, or a callable
+                taking (content, url), that returns a ParsedPage
         '''
-        # TODO: Store parser in registry
-        pass
+        self._parsers[content_type] = getattr(parser, 'parse', parser)
     
-    def parse(self, content: str, url: str, content_type: str = 'text/html') -> ParsedPage:
+    def parse(self, content: Union[str, bytes], url: str, content_type: str = 'text/html') -> ParsedPage:
         '''Parse content using the appropriate parser for content type.
         
-        TODO: Route to registered parser based on content_type.
-        Currently always uses HtmlParser.
-        
         Args:
-            content: Content to parse
+            content: Content to parse, as string or raw bytes
             url: URL of the content
             content_type: MIME type of the content
             
         Returns:
             ParsedPage with extracted information
         '''
-        # TODO: Look up parser by content_type and use it
-        # For now, always use default HTML parser
-        return self._default_parser.parse(content, url)
+        return self._parsers.get(content_type, self._default_parse)(content, url)
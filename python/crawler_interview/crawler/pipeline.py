@@ -1,19 +1,110 @@
 '''Main pipeline for orchestrating the crawling process.'''
-from typing import Iterable, List
-from urllib.parse import urlparse
+import asyncio
+import math
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from urllib.parse import urlsplit, urlunsplit
 
 from crawler.clock import FakeClock
-from crawler.fetch import FakeFetcher
+from crawler.fetch import FakeFetcher, extract_domain
 from crawler.parse import ParserRegistry, ParsedPage
 from crawler.storage import StorageBackend
 from crawler.politeness import PolitenessPolicy
+from crawler.seen import SeenStore
+
+
+# Sentinel marking the end of a stage's output
+_DONE = object()
+
+# Most fetches allowed in flight against one host at a time
+_HOST_CONCURRENCY = 64
+
+# Most parsed pages a worker holds before writing them with store_many()
+_STORE_BATCH_SIZE = 32
+
+_DEFAULT_PORTS = {'http': ':80', 'https': ':443'}
+
+# URL extension -> content type; anything else is treated as HTML
+_SUFFIX_CONTENT_TYPES = {
+    'json': 'application/json',
+    'xml': 'application/xml',
+    'html': 'text/html',
+    'htm': 'text/html',
+}
+
+
+def _normalize_url(url: str) -> str:
+    '''Build the dedup key for a URL.
+    
+    Lowercases the scheme and host, drops the scheme's default port, a
+    trailing slash and any fragment, so trivially different spellings of
+    the same page share one key.
+    
+    Args:
+        url: URL to normalize
+        
+    Returns:
+        Normalized URL string
+    '''
+    scheme, netloc, path, query, _ = urlsplit(url)
+    scheme = scheme.lower()
+    netloc = netloc.lower()
+    default_port = _DEFAULT_PORTS.get(scheme)
+    if default_port and netloc.endswith(default_port):
+        netloc = netloc[:-len(default_port)]
+    return urlunsplit((scheme, netloc, path.rstrip('/'), query, ''))
+
+
+def _host(url: str) -> str:
+    '''Get the politeness key for a URL: its host, lowercased, without port.
+    
+    Built on extract_domain's str.find scan rather than urlparse, since it
+    runs once per fetched URL.
+    
+    Args:
+        url: URL to key
+        
+    Returns:
+        Lowercased host name
+    '''
+    netloc = extract_domain(url)
+    host, sep, port = netloc.rpartition(':')
+    # A ']' after the last colon means it belonged to an IPv6 literal
+    if sep and ']' not in port:
+        netloc = host
+    return netloc.lower()
+
+
+def _step_to(now: float, target: float) -> float:
+    '''Get a positive clock step that takes time `now` to at least `target`.
+    
+    target - now can round so that now + step lands just short of target
+    (or be zero), which would leave a rate-limited domain blocked forever;
+    the step is nudged up one float at a time until it arrives.
+    
+    Args:
+        now: Current clock time
+        target: Time to reach
+        
+    Returns:
+        Seconds to advance; never zero
+    '''
+    step = max(target - now, math.ulp(now))
+    while now + step < target:
+        step = math.nextafter(step, math.inf)
+    return step
 
 
 class Pipeline:
     '''Pipeline for fetching, parsing, and storing web pages.
     
-    TODO: Implement concurrent processing, streaming, and bounded backpressure.
-    Currently processes URLs sequentially and returns all results in memory.
+    A single producer coroutine keeps up to max_workers fetches in flight
+    and feeds a bounded queue; max_workers worker coroutines parse
+    and store what it fetched. The queue's maxsize makes the producer wait
+    whenever the workers fall behind, so at most queue_size fetched pages
+    are held at once. Results are streamed to storage (and optionally to
+    the caller), never collected into a list.
     '''
     
     def __init__(
@@ -23,7 +114,9 @@ class Pipeline:
         storage: StorageBackend,
         politeness: PolitenessPolicy,
         clock: FakeClock,
-        max_workers: int = 1
+        max_workers: int = 1,
+        queue_size: int = 100,
+        seen_store: Optional[SeenStore] = None
     ):
         '''Initialize the pipeline.
         
@@ -33,60 +126,283 @@ class Pipeline:
             storage: StorageBackend instance
             politeness: PolitenessPolicy instance
             clock: FakeClock instance
-            max_workers: Maximum concurrent workers (TODO: not implemented)
+            max_workers: Number of concurrent fetches and parse/store worker coroutines
+            queue_size: Maximum number of fetched pages waiting to be parsed
+            seen_store: Dedup store for very large crawls; defaults to an
+                in-memory set
         '''
         self._fetcher = fetcher
         self._parser_registry = parser_registry
         self._storage = storage
         self._politeness = politeness
         self._clock = clock
+        self._fetch_async = getattr(fetcher, 'fetch_async', None)  # resolved once, not per fetch
         self._max_workers = max_workers
+        self._queue_size = queue_size
+        self._max_queue_size_observed = 0
+        # Normalized URLs already handed to the fetcher
+        self._seen: Union[Set[str], SeenStore] = seen_store if seen_store is not None else set()
+    
+    def get_max_queue_size_observed(self) -> int:
+        '''Get the largest fetch->parse queue depth seen so far.
+        
+        Returns:
+            Maximum number of fetched pages that were waiting at once
+        '''
+        return self._max_queue_size_observed
+    
+    def seen_count(self) -> int:
+        '''Get the number of distinct URLs the pipeline has accepted.
+        
+        Returns:
+            Number of unique normalized URLs seen so far
+        '''
+        return len(self._seen)
     
-    def process(self, urls: Iterable[str]) -> List[ParsedPage]:
-        '''Process an iterable of URLs.
+    def process(self, urls: Iterable[str]) -> None:
+        '''Process an iterable of URLs, streaming every page to storage.
         
-        TODO: Implement:
-        1. Concurrent fetching and parsing (use max_workers)
-        2. Streaming results to storage (don't build large in-memory list)
-        3. Bounded queue between fetch and parse stages
-        4. Duplicate URL detection
-        5. Politeness policy enforcement
+        Nothing is accumulated in memory beyond the bounded queues, so the
+        input can be an arbitrarily long generator. URLs already seen by
+        this pipeline (after normalization) are skipped without fetching,
+        and fetches wait (in FakeClock time) until the politeness policy
+        allows another request to the URL's domain.
         
-        Currently: Sequential processing, returns all pages in memory.
+        Args:
+            urls: Iterable of URLs to process
+        '''
+        asyncio.run(self._drain(urls))
+    
+    def iter_process(self, urls: Iterable[str]) -> Iterator[ParsedPage]:
+        '''Process URLs and yield each page once it has been stored.
         
         Args:
             urls: Iterable of URLs to process
             
-        Returns:
-            List of ParsedPage objects (TODO: should stream, not return list)
+        Yields:
+            ParsedPage objects in the order they were stored
         '''
-        # TODO: Implement concurrency with thread pool or asyncio
-        # TODO: Implement streaming (yield/store incrementally)
-        # TODO: Implement bounded queue for backpressure
-        # TODO: Check for duplicate URLs
-        # TODO: Check politeness policy before fetching
-        
-        # Naive sequential implementation
-        results = []
-        for url in urls:
-            try:
-                # Fetch HTML
-                html = self._fetcher.fetch(url, self._clock.now())
-                
-                # Determine content type (naive: check extension)
-                content_type = 'text/html'
-                if url.endswith('.json'):
-                    content_type = 'application/json'
-                
-                # Parse
-                parsed = self._parser_registry.parse(html, url, content_type)
+        loop = asyncio.new_event_loop()
+        pages = self.stream(urls)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(pages.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(pages.aclose())
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+    
+    async def stream(self, urls: Iterable[str]) -> AsyncIterator[ParsedPage]:
+        '''Process URLs and asynchronously yield each page once stored.
+        
+        Stored pages pass through a results queue bounded by queue_size,
+        so a slow consumer also slows the workers and, through them, the
+        producer.
+        
+        Args:
+            urls: Iterable of URLs to process
+            
+        Yields:
+            ParsedPage objects in the order they were stored
+        '''
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        results: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='fetch')
+        producer = asyncio.create_task(self._produce(urls, fetched, executor))
+        workers = [
+            asyncio.create_task(self._work(fetched, results))
+            for _ in range(self._max_workers)
+        ]
+        tasks = [producer, *workers]
+        try:
+            remaining = self._max_workers
+            while remaining:
+                page = await results.get()
+                if page is _DONE:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield page
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    async def _drain(self, urls: Iterable[str]) -> None:
+        '''Consume stream() without keeping any pages.
+        
+        Args:
+            urls: Iterable of URLs to process
+        '''
+        async for _ in self.stream(urls):
+            pass
+    
+    async def _produce(
+        self,
+        urls: Iterable[str],
+        fetched: asyncio.Queue,
+        executor: ThreadPoolExecutor
+    ) -> None:
+        '''Fetch each URL and hand it to the parse workers.
+        
+        Up to max_workers fetches run at once as tasks on this event loop,
+        and at most _HOST_CONCURRENCY of them against any one host. Dedup and
+        politeness decisions are still made here, one URL at a time, and
+        fetched pages are forwarded in submission order.
+        
+        Args:
+            urls: Iterable of URLs to process
+            fetched: Bounded queue of (url, content_type, content) items,
+                followed by one end marker per worker
+            executor: Thread pool for fetchers without fetch_async()
+        '''
+        # Bind everything the per-URL loop touches as locals up front
+        loop = asyncio.get_running_loop()
+        create_task = loop.create_task
+        seen = self._seen
+        seen_add = seen.add
+        fetch = self._fetch
+        forward = self._forward
+        clock_now = self._clock.now
+        clock_advance = self._clock.advance
+        try_acquire = self._politeness.try_acquire
+        ready_at = self._politeness.ready_at
+        max_in_flight = self._max_workers
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+        in_flight: Deque[Tuple[str, asyncio.Task]] = deque()
+        try:
+            for url in urls:
+                # The producer is the only writer, so no lock is needed
+                key = _normalize_url(url)
+                if key in seen:
+                    continue
+                seen_add(key)
                 
-                # Store
-                self._storage.store(parsed)
-                results.append(parsed)
+                # Wait out the domain's rate limit by advancing simulated time
+                # to the moment a slot frees up; the clock is read once per
+                # URL unless we actually had to wait
+                domain = _host(url)
+                now = clock_now()
+                while not try_acquire(domain, now):
+                    clock_advance(_step_to(now, ready_at(domain, now)))
+                    now = clock_now()
                 
-            except ValueError as e:
-                # Simulated fetch failure - skip
-                pass
+                limit = host_limits.get(domain)
+                if limit is None:
+                    limit = host_limits[domain] = asyncio.Semaphore(_HOST_CONCURRENCY)
+                in_flight.append((url, create_task(fetch(url, now, limit, executor))))
+                if len(in_flight) >= max_in_flight:
+                    await forward(*in_flight.popleft(), fetched)
+            while in_flight:
+                await forward(*in_flight.popleft(), fetched)
+        except Exception as exc:
+            end = exc
+        else:
+            end = _DONE
+        finally:
+            if in_flight:
+                tasks = [task for _, task in in_flight]
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        # Not in the finally: a cancelled producer must not block on a full queue
+        for _ in range(self._max_workers):
+            await fetched.put(end)
+    
+    async def _fetch(
+        self,
+        url: str,
+        now: float,
+        limit: asyncio.Semaphore,
+        executor: ThreadPoolExecutor
+    ) -> str:
+        '''Fetch one URL while holding its host's concurrency slot.
+        
+        Fetchers with a fetch_async() coroutine are awaited directly; a
+        plain blocking fetch() runs on the executor instead.
         
-        return results
+        Args:
+            url: URL to fetch
+            now: Time the fetch was scheduled (from FakeClock)
+            limit: Semaphore capping concurrent fetches to the URL's host
+            executor: Thread pool for blocking fetchers
+            
+        Returns:
+            HTML content as string
+        '''
+        async with limit:
+            fetch_async = self._fetch_async
+            if fetch_async is not None:
+                return await fetch_async(url, now)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, self._fetcher.fetch, url, now)
+    
+    async def _forward(self, url: str, future: asyncio.Future, fetched: asyncio.Queue) -> None:
+        '''Wait for one fetch and queue its page for parsing.
+        
+        Args:
+            url: URL that was fetched
+            future: Pending fetch task
+            fetched: Bounded queue of (url, content_type, content) items
+        '''
+        try:
+            html = await future
+        except ValueError:
+            # Simulated fetch failure - skip
+            return
+        
+        # Determine content type from the URL extension: one split, one lookup
+        content_type = _SUFFIX_CONTENT_TYPES.get(url.rsplit('.', 1)[-1], 'text/html')
+        
+        await fetched.put((url, content_type, html))
+        self._max_queue_size_observed = max(self._max_queue_size_observed, fetched.qsize())
+    
+    async def _work(self, fetched: asyncio.Queue, results: asyncio.Queue) -> None:
+        '''Parse and store fetched pages until the producer is done.
+        
+        Parsed pages are written with storage.store_many() in batches of up
+        to _STORE_BATCH_SIZE. A batch is flushed early whenever no more
+        fetched pages are ready, so batching never holds a page back.
+        
+        Every worker ends by putting one end marker on the results queue:
+        _DONE, or the exception that stopped it or the producer.
+        
+        Args:
+            fetched: Bounded queue of (url, content_type, content) items
+            results: Bounded queue receiving each stored page
+        '''
+        parse = self._parser_registry.parse
+        batch: List[ParsedPage] = []
+        try:
+            while True:
+                item = await fetched.get()
+                if not isinstance(item, tuple):
+                    end = item
+                    break
+                url, content_type, html = item
+                batch.append(parse(html, url, content_type))
+                if len(batch) >= _STORE_BATCH_SIZE or fetched.empty():
+                    await self._flush(batch, results)
+            await self._flush(batch, results)
+        except Exception as exc:
+            end = exc
+        await results.put(end)
+    
+    async def _flush(self, batch: List[ParsedPage], results: asyncio.Queue) -> None:
+        '''Store a batch of parsed pages, pass them on and empty the batch.
+        
+        Args:
+            batch: Parsed pages not yet stored
+            results: Bounded queue receiving each stored page
+        '''
+        if not batch:
+            return
+        self._storage.store_many(batch)
+        for page in batch:
+            await results.put(page)
+        batch.clear()
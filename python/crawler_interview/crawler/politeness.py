@@ -1,12 +1,17 @@
 '''Politeness policy for rate limiting per-domain requests.'''
-from typing import Dict
+from collections import deque
+from typing import Deque, Dict
 
 
 class PolitenessPolicy:
     '''Policy for enforcing per-domain rate limits.
     
-    TODO: Implement per-domain rate limiting (max 2 requests per 10 seconds per domain).
-    Currently always returns True as a stub implementation.
+    Keeps a sliding window per domain in a deque holding, for each
+    request, the time it stops counting (request time + window_seconds).
+    Expiry times arrive in order, so expired ones are always at the left
+    end and are evicted with popleft() in amortized O(1). Eviction and
+    ready_at() compare the same stored value, so a request counts until
+    exactly ready_at() and no longer.
     '''
     
     def __init__(self, max_requests: int = 2, window_seconds: float = 10.0):
@@ -15,19 +20,36 @@ class PolitenessPolicy:
         Args:
             max_requests: Maximum requests allowed per window
             window_seconds: Time window in seconds
+            
+        Raises:
+            ValueError: If max_requests is not positive
         '''
+        if max_requests <= 0:
+            raise ValueError(f'max_requests must be positive, got {max_requests}')
         self._max_requests = max_requests
         self._window_seconds = window_seconds
-        self._domain_requests: Dict[str, list] = {}
+        self._domain_requests: Dict[str, Deque[float]] = {}
+    
+    def _window(self, domain: str, now: float) -> Deque[float]:
+        '''Get a domain's expiry times with those already expired evicted.
+        
+        Args:
+            domain: Domain name
+            now: Current time in seconds (from FakeClock)
+            
+        Returns:
+            Expiry times of requests that still count against the limit
+        '''
+        window = self._domain_requests.get(domain)
+        if window is None:
+            window = self._domain_requests[domain] = deque()
+        while window and window[0] <= now:
+            window.popleft()
+        return window
     
     def allow(self, domain: str, now: float) -> bool:
         '''Check if a request to the domain is allowed at the given time.
         
-        TODO: Implement per-domain rate limiting logic.
-        Should track request timestamps per domain and enforce:
-        - Max 2 requests per 10 seconds per domain
-        - Use the 'now' parameter (from FakeClock) for deterministic testing
-        
         Args:
             domain: Domain name to check
             now: Current time in seconds (from FakeClock)
@@ -35,18 +57,63 @@ class PolitenessPolicy:
         Returns:
             True if request is allowed, False otherwise
         '''
-        # TODO: Implement rate limiting
-        # For now, always allow (stub implementation)
-        return True
+        return len(self._window(domain, now)) < self._max_requests
     
     def record(self, domain: str, now: float) -> None:
         '''Record a request to the domain at the given time.
         
-        TODO: Implement request tracking.
+        Args:
+            domain: Domain name
+            now: Current time in seconds (from FakeClock)
+        '''
+        self._window(domain, now).append(now + self._window_seconds)
+    
+    def try_acquire(self, domain: str, now: float) -> bool:
+        '''Record a request to the domain if one is allowed at the given time.
+        
+        Equivalent to allow() followed by record(), with a single window
+        lookup and eviction pass.
         
         Args:
             domain: Domain name
             now: Current time in seconds (from FakeClock)
+            
+        Returns:
+            True if the request was allowed and recorded, False otherwise
+        '''
+        window = self._window(domain, now)
+        if len(window) >= self._max_requests:
+            return False
+        window.append(now + self._window_seconds)
+        return True
+    
+    def ready_at(self, domain: str, now: float) -> float:
+        '''Get the earliest time a request to the domain is allowed.
+        
+        At that exact time try_acquire() succeeds: it evicts by comparing
+        the same stored expiry time against the clock.
+        
+        Args:
+            domain: Domain name
+            now: Current time in seconds (from FakeClock)
+            
+        Returns:
+            Time at which allow() returns True (now if allowed already)
+        '''
+        window = self._window(domain, now)
+        if len(window) < self._max_requests:
+            return now
+        # The slot frees up once the oldest request that still counts expires
+        return window[-self._max_requests]
+    
+    def wait_time(self, domain: str, now: float) -> float:
+        '''Get how long to wait until a request to the domain is allowed.
+        
+        Args:
+            domain: Domain name
+            now: Current time in seconds (from FakeClock)
+            
+        Returns:
+            Seconds until allow() would return True (0.0 if allowed now)
         '''
-        # TODO: Track request timestamps
-        pass
+        return self.ready_at(domain, now) - now
@@ -0,0 +1,141 @@
+'''Memory-bounded store of URLs the crawler has already seen.'''
+import hashlib
+import math
+import sqlite3
+from typing import List
+
+
+class BloomFilter:
+    '''Fixed-size Bloom filter over strings.
+    
+    Sized for capacity keys at the given false-positive rate. Bit
+    positions come from one 128-bit blake2b digest split into two hashes
+    (double hashing), so every key costs a single hash call.
+    '''
+    
+    def __init__(self, capacity: int, error_rate: float):
+        '''Initialize an empty filter.
+        
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: Target false-positive rate at capacity
+        '''
+        self.capacity = capacity
+        self._num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._num_hashes = max(1, round(self._num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self._num_bits + 7) // 8)
+        self.count = 0
+    
+    def _positions(self, key: str) -> List[int]:
+        '''Get the bit positions for a key.
+        
+        Args:
+            key: Key to hash
+            
+        Returns:
+            num_hashes bit indexes into the filter
+        '''
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self._num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self._num_hashes)]
+    
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+    
+    def add(self, key: str) -> None:
+        '''Add a key to the filter.
+        
+        Args:
+            key: Key to add
+        '''
+        bits = self._bits
+        for pos in self._positions(key):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+
+class SeenStore:
+    '''Set-like store of seen keys that keeps the keys out of Python objects.
+    
+    A scalable Bloom filter answers "definitely new" in memory; only keys
+    it reports as possibly seen are confirmed against an exact SQLite
+    table, which lives in memory by default or in a file for crawls too
+    large for RAM. When the newest filter reaches capacity, a new one with
+    twice the capacity and a tighter error rate is added, keeping the
+    overall false-positive rate bounded. Supports the subset of the set
+    API the pipeline uses: `in`, add() and len().
+    
+    Inserts are committed in batches of commit_every and on close(), so a
+    file-backed store reopened later sees every key added before close().
+    '''
+    
+    def __init__(
+        self,
+        path: str = ':memory:',
+        initial_capacity: int = 100_000,
+        error_rate: float = 0.001,
+        commit_every: int = 1000
+    ):
+        '''Initialize an empty store.
+        
+        Args:
+            path: SQLite database path for the exact tier
+            initial_capacity: Keys the first Bloom filter is sized for
+            error_rate: False-positive rate of the first Bloom filter
+            commit_every: Inserts per SQLite transaction; fewer commits
+                are faster, but a crash loses up to this many keys
+        '''
+        self._error_rate = error_rate
+        self._commit_every = commit_every
+        self._uncommitted = 0
+        self._filters = [BloomFilter(initial_capacity, error_rate)]
+        self._db = sqlite3.connect(path)
+        self._db.execute('CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY) WITHOUT ROWID')
+        self._count = 0
+        # Reopening an existing database: rebuild the filters from its keys
+        for (key,) in self._db.execute('SELECT key FROM seen'):
+            self._remember(key)
+    
+    def __contains__(self, key: str) -> bool:
+        if not any(key in bloom for bloom in self._filters):
+            return False
+        row = self._db.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone()
+        return row is not None
+    
+    def add(self, key: str) -> None:
+        '''Record a key as seen; adding a key twice has no effect.
+        
+        Args:
+            key: Key to record
+        '''
+        if self._db.execute('INSERT OR IGNORE INTO seen (key) VALUES (?)', (key,)).rowcount:
+            self._remember(key)
+            self._uncommitted += 1
+            if self._uncommitted >= self._commit_every:
+                self._db.commit()
+                self._uncommitted = 0
+    
+    def _remember(self, key: str) -> None:
+        '''Count a key newly stored in SQLite and add it to the Bloom filters.
+        
+        Args:
+            key: Key just stored
+        '''
+        self._count += 1
+        bloom = self._filters[-1]
+        if bloom.count >= bloom.capacity:
+            # Each new filter halves the error rate so the sum stays bounded
+            bloom = BloomFilter(bloom.capacity * 2, self._error_rate / 2 ** len(self._filters))
+            self._filters.append(bloom)
+        bloom.add(key)
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def close(self) -> None:
+        '''Commit any pending inserts and close the underlying SQLite connection.'''
+        self._db.commit()
+        self._db.close()
@@ -1,6 +1,6 @@
 '''Storage backends for persisting crawled pages.'''
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterable, List
 from crawler.parse import ParsedPage
 
 
@@ -16,6 +16,18 @@ class StorageBackend(ABC):
         '''
         pass
     
+    def store_many(self, pages: Iterable[ParsedPage]) -> None:
+        '''Store a batch of parsed pages.
+        
+        The default calls store() for each page; backends with a bulk write
+        path should override it.
+        
+        Args:
+            pages: ParsedPages to store, in order
+        '''
+        for page in pages:
+            self.store(page)
+    
     @abstractmethod
     def get_all(self) -> List[ParsedPage]:
         '''Retrieve all stored pages.
@@ -50,6 +62,20 @@ class InMemoryStorage(StorageBackend):
         '''
         self._pages.append(page)
     
+    def store_many(self, pages: Iterable[ParsedPage]) -> None:
+        '''Store a batch of parsed pages with a single list.extend().
+        
+        Subclasses that override store() keep getting one store() call per
+        page.
+        
+        Args:
+            pages: ParsedPages to store, in order
+        '''
+        if type(self).store is not InMemoryStorage.store:
+            super().store_many(pages)
+            return
+        self._pages.extend(pages)
+    
     def get_all(self) -> List[ParsedPage]:
         '''Retrieve all stored pages.
         
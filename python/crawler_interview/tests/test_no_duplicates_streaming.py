@@ -4,12 +4,15 @@ This test verifies that the pipeline:
 1. Deduplicates URLs (never processes the same URL twice)
 2. Streams results incrementally without building large in-memory lists
 '''
+import asyncio
+
 from crawler.clock import FakeClock
 from crawler.fetch import FakeFetcher
 from crawler.parse import ParserRegistry
 from crawler.storage import InMemoryStorage
 from crawler.politeness import PolitenessPolicy
 from crawler.pipeline import Pipeline
+from crawler.seen import SeenStore
 
 
 def url_generator_with_duplicates(num_unique: int, duplicates_per_url: int):
@@ -74,11 +77,12 @@ def test_streaming_without_large_in_memory_list():
         for i in range(num_urls):
             yield f'http://example.com/page{i}'
     
-    html_bodies = {f'http://example.com/page{i}': f'<html><head><title>Page {i}</title></head></html>'
-                   for i in range(num_urls)}
+    # Build bodies on demand instead of materializing all of them up front
+    def html_body(url, now):
+        return f'<html><head><title>Page {url.rsplit("page", 1)[-1]}</title></head></html>'
     
     clock = FakeClock()
-    fetcher = FakeFetcher(html_bodies)
+    fetcher = FakeFetcher(html_body)
     parser = ParserRegistry()
     storage = InMemoryStorage()
     politeness = PolitenessPolicy()
@@ -137,3 +141,141 @@ def test_streaming_with_storage_counter():
     # held in memory. The fact that process() returns a list is the problem.
     # This assertion will PASS even with current implementation, but the
     # memory usage test (result is None) above will FAIL.
+
+
+def test_no_duplicate_urls_with_seen_store():
+    '''Test deduplication through the Bloom filter + SQLite SeenStore.
+    
+    A tiny initial capacity forces the store to grow several filters.
+    '''
+    num_unique = 200
+    urls = url_generator_with_duplicates(num_unique, 3)
+    
+    clock = FakeClock()
+    fetcher = FakeFetcher({})
+    storage = InMemoryStorage()
+    seen_store = SeenStore(initial_capacity=16)
+    
+    pipeline = Pipeline(
+        fetcher, ParserRegistry(), storage, PolitenessPolicy(), clock,
+        max_workers=4, seen_store=seen_store
+    )
+    pipeline.process(urls)
+    
+    assert storage.count() == num_unique
+    assert fetcher.get_fetch_count() == num_unique
+    assert pipeline.seen_count() == num_unique
+    seen_store.close()
+
+
+def test_seen_store_survives_reopen(tmp_path):
+    '''Test that a file-backed SeenStore keeps its keys across close() and reopen.
+    
+    commit_every is larger than the number of keys, so only the commit in
+    close() can persist them.
+    '''
+    path = str(tmp_path / 'seen.db')
+    seen_store = SeenStore(path, initial_capacity=16, commit_every=1000)
+    for i in range(50):
+        seen_store.add(f'http://example.com/page{i}')
+    seen_store.close()
+    
+    reopened = SeenStore(path, initial_capacity=16)
+    assert len(reopened) == 50
+    assert 'http://example.com/page0' in reopened
+    assert 'http://example.com/page49' in reopened
+    assert 'http://example.com/page50' not in reopened
+    reopened.close()
+
+
+def _make_pipeline(clock=None, **kwargs):
+    '''Build a pipeline over FakeFetcher bodies titled after each page.
+    
+    Returns:
+        (pipeline, fetcher, storage, clock)
+    '''
+    bodies = {f'http://example.com/page{i}': f'<title>Page {i}</title>' for i in range(200)}
+    clock = clock or FakeClock()
+    fetcher = FakeFetcher(bodies)
+    storage = InMemoryStorage()
+    pipeline = Pipeline(fetcher, ParserRegistry(), storage, PolitenessPolicy(), clock, **kwargs)
+    return pipeline, fetcher, storage, clock
+
+
+def test_iter_process_yields_every_stored_page_in_order():
+    '''Test that iter_process() yields what process() stores, in input order.
+    
+    Duplicates are skipped as in process(), and each yielded page has
+    already been written to storage.
+    '''
+    urls = list(url_generator_with_duplicates(30, 2))
+    
+    pipeline, _, storage, _ = _make_pipeline(max_workers=1)
+    pages = list(pipeline.iter_process(urls))
+    
+    reference, _, reference_storage, _ = _make_pipeline(max_workers=1)
+    reference.process(urls)
+    
+    assert [page.url for page in pages] == [f'http://example.com/page{i}' for i in range(30)]
+    assert [page.title for page in pages] == [f'Page {i}' for i in range(30)]
+    assert pages == storage.get_all() == reference_storage.get_all()
+    
+    # With several workers every page still comes out exactly once
+    pipeline, _, storage, _ = _make_pipeline(max_workers=4)
+    pages = list(pipeline.iter_process(urls))
+    assert sorted(page.url for page in pages) == sorted(set(urls))
+    assert storage.count() == 30
+
+
+def test_iter_process_close_stops_the_pipeline():
+    '''Test that closing the iterator early stops fetching the rest of the input.'''
+    consumed = []
+    
+    def urls():
+        for i in range(200):
+            consumed.append(i)
+            yield f'http://example.com/page{i}'
+    
+    pipeline, fetcher, _, _ = _make_pipeline(max_workers=2, queue_size=2)
+    pages = pipeline.iter_process(urls())
+    first = next(pages)
+    pages.close()
+    
+    assert first.url == 'http://example.com/page0'
+    assert len(consumed) < 200, 'producer should stop once the consumer is gone'
+    assert fetcher.get_fetch_count() < 200
+
+
+def test_stream_aclose_cancels_pipeline_tasks():
+    '''Test that closing stream() early cancels its producer and worker tasks.'''
+    pipeline, _, _, _ = _make_pipeline(max_workers=3, queue_size=2)
+    
+    async def run():
+        pages = pipeline.stream(f'http://example.com/page{i}' for i in range(200))
+        first = await pages.__anext__()
+        await pages.aclose()
+        leftover = asyncio.all_tasks() - {asyncio.current_task()}
+        return first, leftover
+    
+    first, leftover = asyncio.run(run())
+    
+    assert first.title == 'Page 0'
+    assert leftover == set(), f'tasks left running after aclose(): {leftover}'
+
+
+def test_stream_politeness_advances_clock():
+    '''Test that rate-limited fetches through stream() wait in FakeClock time.
+    
+    The default policy allows 2 requests per 10s per domain, so 6 pages
+    from one domain need the clock to move 20s past its start.
+    '''
+    pipeline, fetcher, _, clock = _make_pipeline(clock=FakeClock(100.0), max_workers=2)
+    
+    async def run():
+        return [page async for page in pipeline.stream(f'http://example.com/page{i}' for i in range(6))]
+    
+    pages = asyncio.run(run())
+    
+    assert len(pages) == 6
+    assert fetcher.get_domain_fetch_count('example.com') == 6
+    assert clock.now() >= 120.0
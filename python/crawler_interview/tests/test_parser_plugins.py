@@ -5,6 +5,7 @@ for different content types and route to the correct parser.
 '''
 import pytest
 from crawler.parse import ParserRegistry, ParsedPage
+from crawler.parse import JsonParser as BuiltinJsonParser
 
 
 class JsonParser:
@@ -95,3 +96,46 @@ def test_multiple_parser_plugins():
     assert xml_result.content_type == 'application/xml'
     assert json_result.title == 'JSON'
     assert xml_result.title == 'XML'
+
+
+@pytest.mark.parametrize('head', [
+    '<TITLE>Real</TITLE>',
+    '<Title>Real</Title>',
+    '<title lang="en">Real</title>',
+])
+@pytest.mark.parametrize('as_bytes', [False, True])
+def test_html_parser_takes_first_title_tag(head, as_bytes):
+    '''Test that the first title tag wins, whatever its case or attributes.
+    
+    A later bare lowercase <title> (here inside an inline SVG) must not be
+    picked over it, for str and raw bytes bodies alike.
+    '''
+    html = f'<html><head>{head}</head><body><svg><title>Icon</title></svg></body></html>'
+    content = html.encode() if as_bytes else html
+    
+    page = ParserRegistry().parse(content, 'http://example.com/', 'text/html')
+    
+    assert page.title == 'Real'
+
+
+@pytest.mark.parametrize('content, title', [
+    ('{"title": "JSON Page"}', 'JSON Page'),
+    (b'{"title": "Bytes Page"}', 'Bytes Page'),
+    ('{"body": "no title"}', 'No title'),
+    ('{not json', 'Invalid JSON'),
+    (b'\xff\xfe\xfd', 'Invalid JSON'),
+    ('["a", "list"]', 'Invalid JSON'),
+])
+def test_builtin_json_parser(content, title):
+    '''Test the crawler.parse.JsonParser plugin registered for application/json.
+    
+    Raw bytes bodies are parsed without a separate decode; malformed JSON,
+    undecodable bytes and non-object documents all come back as 'Invalid JSON'.
+    '''
+    registry = ParserRegistry()
+    registry.register('application/json', BuiltinJsonParser())
+    
+    page = registry.parse(content, 'http://example.com/data.json', 'application/json')
+    
+    assert page.title == title
+    assert page.content_type == 'application/json'
@@ -0,0 +1,64 @@
+'''Test the per-domain politeness policy.
+
+This test verifies that the PolitenessPolicy:
+1. Allows at most max_requests per window_seconds per domain
+2. Reports exactly when a rate-limited domain frees up a slot
+3. Never leaves the pipeline waiting forever on float rounding
+'''
+import pytest
+
+from crawler.clock import FakeClock
+from crawler.fetch import FakeFetcher
+from crawler.parse import ParserRegistry
+from crawler.storage import InMemoryStorage
+from crawler.politeness import PolitenessPolicy
+from crawler.pipeline import Pipeline
+
+
+def test_try_acquire_enforces_limit_per_domain():
+    '''Test that try_acquire() admits max_requests per window, per domain.'''
+    politeness = PolitenessPolicy(max_requests=2, window_seconds=10.0)
+    
+    assert politeness.try_acquire('a.com', 0.0)
+    assert politeness.try_acquire('a.com', 1.0)
+    assert not politeness.try_acquire('a.com', 2.0), 'third request in the window should be refused'
+    assert politeness.try_acquire('b.com', 2.0), 'other domains have their own window'
+    
+    # The first request stops counting at exactly t=10
+    assert not politeness.try_acquire('a.com', 9.999)
+    assert politeness.try_acquire('a.com', 10.0)
+
+
+def test_wait_time_matches_try_acquire():
+    '''Test that waiting out wait_time()/ready_at() always makes try_acquire() succeed.'''
+    politeness = PolitenessPolicy(max_requests=2, window_seconds=10.0)
+    assert politeness.wait_time('a.com', 0.0) == 0.0
+    
+    politeness.try_acquire('a.com', 0.0)
+    politeness.try_acquire('a.com', 3.0)
+    assert politeness.wait_time('a.com', 4.0) == 6.0
+    assert politeness.ready_at('a.com', 4.0) == 10.0
+    assert politeness.try_acquire('a.com', politeness.ready_at('a.com', 4.0))
+
+
+def test_rejects_non_positive_max_requests():
+    '''Test that a policy admitting no requests at all is refused up front.'''
+    with pytest.raises(ValueError):
+        PolitenessPolicy(max_requests=0)
+
+
+def test_pipeline_does_not_hang_on_float_rounding():
+    '''Test that the pipeline gets past a rate limit whatever the clock's start time.
+    
+    At this start time, start + 10.0 - start rounds so that advancing the
+    clock by the computed wait used to land just short of the slot's
+    expiry, and the producer spun forever advancing by zero.
+    '''
+    storage = InMemoryStorage()
+    clock = FakeClock(243.910876887132)
+    pipeline = Pipeline(FakeFetcher({}), ParserRegistry(), storage, PolitenessPolicy(), clock)
+    
+    pipeline.process([f'http://example.com/p{i}' for i in range(10)])
+    
+    # 10 requests at 2 per 10s: the last pair goes out 40s in
+    assert clock.now() >= 243.910876887132 + 40.0
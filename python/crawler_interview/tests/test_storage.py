@@ -0,0 +1,48 @@
+'''Test storage backends' batch writes.
+
+This test verifies that store_many():
+1. Stores every page, in order
+2. Still calls store() once per page when a subclass overrides it
+'''
+from crawler.parse import ParsedPage
+from crawler.storage import InMemoryStorage
+
+
+def _pages(n: int):
+    '''Build n distinct HTML pages.'''
+    return [ParsedPage(url=f'http://example.com/p{i}', title=f'Page {i}', content_type='text/html') for i in range(n)]
+
+
+def test_store_many_stores_pages_in_order():
+    '''Test that InMemoryStorage.store_many() keeps every page, in order.'''
+    storage = InMemoryStorage()
+    pages = _pages(5)
+    
+    storage.store_many(pages[:2])
+    storage.store_many(iter(pages[2:]))
+    
+    assert storage.get_all() == pages
+    assert storage.count() == 5
+
+
+def test_store_many_routes_through_overridden_store():
+    '''Test that a subclass overriding store() sees every page from store_many().
+    
+    The bulk list.extend() path must not bypass the override.
+    '''
+    class AuditedStorage(InMemoryStorage):
+        def __init__(self):
+            super().__init__()
+            self.stored = []
+        
+        def store(self, page: ParsedPage) -> None:
+            self.stored.append(page.url)
+            super().store(page)
+    
+    storage = AuditedStorage()
+    pages = _pages(3)
+    
+    storage.store_many(pages)
+    
+    assert storage.stored == [page.url for page in pages]
+    assert storage.get_all() == pages
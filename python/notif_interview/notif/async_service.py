@@ -0,0 +1,114 @@
+"""Asyncio-driven notification service with worker tasks instead of threads."""
+import asyncio
+from typing import List
+from notif.models import Event
+from notif.queueing import QueueFullError
+from notif.service import NotificationService, _RETRY_POLL_INTERVAL, _SEND_BATCH_SIZE
+
+
+class AsyncNotificationService(NotificationService):
+    """
+    Notification service whose workers are tasks on one event loop.
+
+    Events wait in an asyncio.Queue bounded by max_queue_size, and start()
+    launches `workers` consumer tasks; a task costs a coroutine frame
+    rather than a thread stack, and switching between them never leaves
+    user space. Dedup, rate limiting and batched sending are shared with
+    NotificationService. start() must be called from inside a running
+    event loop, and the service is shut down with `await aclose()`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the service; takes the same arguments as NotificationService."""
+        super().__init__(*args, **kwargs)
+        self._events: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size or 0)
+        self._tasks: List[asyncio.Task] = []
+
+    def enqueue(self, event: Event) -> None:
+        """
+        Add event to processing queue without blocking.
+
+        Args:
+            event: Event to process
+
+        Raises:
+            QueueFullError: If queue is at max_queue_size
+        """
+        try:
+            self._events.put_nowait(event)
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise QueueFullError(f'queue is full ({self.max_queue_size} items)') from None
+
+    def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        if self._running:
+            return
+        self._running = True
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def aclose(self) -> None:
+        """
+        Wait until every queued event has been processed, then stop the workers.
+
+        Retries that are not yet due stay scheduled for process_once().
+        """
+        if not self._running:
+            return
+        self._running = False
+        await self._events.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _worker(self) -> None:
+        """Process due retries and events as they arrive, batching whatever is already queued."""
+        events_queue = self._events
+        process_batch = self._process_batch
+        take_due_retries = self._take_due_retries
+        while True:
+            # Leave room for at least one queued event in the batch
+            events: List[Event] = take_due_retries(_SEND_BATCH_SIZE - 1)
+            dequeued = 0  # Queue items taken, which each need a task_done()
+            if not events:
+                if self._retries:
+                    # Wake up periodically so pending retries go out once due
+                    try:
+                        event = await asyncio.wait_for(events_queue.get(), _RETRY_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        continue
+                else:
+                    event = await events_queue.get()
+                events.append(event)
+                dequeued = 1
+            while len(events) < _SEND_BATCH_SIZE and not events_queue.empty():
+                events.append(events_queue.get_nowait())
+                dequeued += 1
+            try:
+                process_batch(events)
+            finally:
+                for _ in range(dequeued):
+                    events_queue.task_done()
+
+    def process_once(self) -> bool:
+        """
+        Process one due retry, or else one event from the queue, on the
+        calling thread.
+
+        Returns:
+            True if an event was processed, False if there was nothing to do
+        """
+        due = self._take_due_retries(1)
+        if due:
+            self._process_batch(due)
+            return True
+        try:
+            event = self._events.get_nowait()
+        except asyncio.QueueEmpty:
+            return False
+        try:
+            self._process_batch([event])
+        finally:
+            self._events.task_done()
+        return True
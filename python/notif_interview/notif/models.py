@@ -1,18 +1,31 @@
 """Data models for events and notifications."""
-from dataclasses import dataclass
-from typing import Dict
+import sys
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Type
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Event:
-    """An event that triggers a notification."""
+    """
+    An event that triggers a notification.
+    
+    Immutable and hashable on (id, user_id, channel); the payload dict is
+    left out of the hash. user_id and channel are interned, since a few
+    distinct values repeat across every event and are compared and
+    hashed as rate-limit and factory keys.
+    """
     id: str
     user_id: str
     channel: str
-    payload: Dict
+    payload: Dict = field(hash=False)
+    
+    def __post_init__(self):
+        # Frozen, so bypass the generated __setattr__
+        object.__setattr__(self, 'user_id', sys.intern(self.user_id))
+        object.__setattr__(self, 'channel', sys.intern(self.channel))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DeliveryResult:
     """Result of attempting to deliver a notification."""
     ok: bool
@@ -20,7 +33,13 @@ class DeliveryResult:
 
 
 class Notification:
-    """Base class for all notification types."""
+    """Base class for all notification types.
+    
+    Declares __slots__ so instances carry no per-object __dict__; subclasses
+    that add no attributes should declare an empty __slots__ too.
+    """
+    
+    __slots__ = ('event',)
     
     def __init__(self, event: Event):
         self.event = event
@@ -33,6 +52,8 @@ class Notification:
 class EmailNotification(Notification):
     """Email notification."""
     
+    __slots__ = ()
+    
     def to_message(self) -> str:
         """Convert to email message."""
         subject = self.event.payload.get('subject', 'No subject')
@@ -43,12 +64,52 @@ class EmailNotification(Notification):
 class SMSNotification(Notification):
     """SMS notification."""
     
+    __slots__ = ()
+    
     def to_message(self) -> str:
         """Convert to SMS message."""
         text = self.event.payload.get('text', '')
         return f'SMS to {self.event.user_id}: {text}'
 
 
-# TODO: Factory - Add notification factory/registry pattern here
-# Currently, channel -> notification class mapping is hardcoded in service.py
-# Interviewee should create a factory that allows registering new notification types
+# Channel -> Notification class; extended via register_notification()
+_FACTORY: Dict[str, Type[Notification]] = {
+    'email': EmailNotification,
+    'sms': SMSNotification,
+}
+
+
+def register_notification(channel: str, cls: Type[Notification]) -> None:
+    """
+    Register the Notification class used for a channel.
+    
+    Registering an existing channel replaces its class.
+    
+    Args:
+        channel: Channel name, as found in Event.channel
+        cls: Notification subclass to build for events on that channel
+    """
+    _FACTORY[sys.intern(channel)] = cls
+
+
+def get_notification_class(channel: str) -> Optional[Type[Notification]]:
+    """
+    Look up the Notification class registered for a channel.
+    
+    Args:
+        channel: Channel name
+        
+    Returns:
+        The registered class, or None for an unknown channel
+    """
+    return _FACTORY.get(channel)
+
+
+def registered_notifications() -> Dict[str, Type[Notification]]:
+    """
+    Get a snapshot of the channel -> Notification class registry.
+    
+    Returns:
+        A new dict; changing it does not affect the registry
+    """
+    return dict(_FACTORY)
@@ -1,42 +1,166 @@
 """In-memory queue for notifications."""
-from typing import Optional, Any
+import queue
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, List, Optional
 
 
 class InMemoryQueue:
     """
-    Simple list-based queue.
+    Bounded FIFO queue built on queue.Queue.
 
-    WARNING: This implementation is NOT thread-safe!
-    Multiple threads calling push/pop simultaneously will cause race conditions.
+    queue.Queue keeps its items in a deque and does the capacity check and
+    the append under one lock, so push/pop are O(1) and safe to call from
+    several worker threads. A max_queue_size of None means unbounded.
     """
 
-    def __init__(self, max_queue_size):
-        self._items = []
+    def __init__(self, max_queue_size: Optional[int] = None):
+        self._items: queue.Queue = queue.Queue(maxsize=max_queue_size or 0)
         self._max_queue_size = max_queue_size
 
-    def push(self, item: Any) -> None:
-        """Add item to queue."""
-        # TODO: Backpressure - Add max_queue_size check here
-        # Should raise QueueFullError when queue is full
-        self._items.append(item)
+    def push(self, item: Any, block: bool = False, timeout: Optional[float] = None) -> None:
+        """
+        Add item to queue.
 
-    def pop(self) -> Optional[Any]:
-        """Remove and return item from queue, or None if empty."""
-        if not self._items:
+        By default a full queue rejects the item immediately; pass
+        block=True to wait (up to timeout seconds) for a free slot instead.
+
+        Raises:
+            QueueFullError: If the queue is still full
+        """
+        try:
+            self._items.put(item, block, timeout)
+        except queue.Full:
+            raise QueueFullError(f'queue is full ({self._max_queue_size} items)') from None
+
+    def pop(self, block: bool = False, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Remove and return item from queue, or None if empty.
+
+        With block=True, waits (up to timeout seconds, or indefinitely)
+        for an item instead of returning None straight away.
+        """
+        try:
+            return self._items.get(block, timeout)
+        except queue.Empty:
             return None
-        return self._items.pop(0)
 
     def size(self) -> int:
         """Return current queue size."""
-        return len(self._items)
+        return self._items.qsize()
+
+    def is_empty(self) -> bool:
+        """Check if queue is empty."""
+        return self._items.empty()
+
+    def is_full(self) -> bool:
+        """Check if queue is full (never, when unbounded)"""
+        return self._items.full()
+
+
+class DedupWorkQueue:
+    """
+    Bounded FIFO queue that coalesces items sharing a key.
+
+    Pushing an item whose key is already waiting replaces the waiting item
+    in place (keeping its position) instead of queueing a second copy, so a
+    burst of duplicates costs one slot and one processing run, carrying the
+    latest version. Items whose key is None are never coalesced.
+
+    Same interface and thread-safety as InMemoryQueue; max_queue_size
+    counts distinct waiting keys, so a coalescing push never fails.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: Optional[int] = None,
+        key: Optional[Callable[[Any], Optional[Hashable]]] = None,
+    ):
+        """
+        Initialize an empty queue.
+
+        Args:
+            max_queue_size: Maximum number of waiting items; None means unbounded
+            key: Maps an item to its coalescing key (None: never coalesce);
+                defaults to the item itself
+        """
+        self._max_queue_size = max_queue_size
+        self._key = key or (lambda item: item)
+        self._order: Deque[Hashable] = deque()
+        self._pending: Dict[Hashable, Any] = {}
+        lock = threading.Lock()
+        self._not_empty = threading.Condition(lock)
+        self._not_full = threading.Condition(lock)
+
+    def _has_room(self) -> bool:
+        return not self._max_queue_size or len(self._order) < self._max_queue_size
+
+    def push(self, item: Any, block: bool = False, timeout: Optional[float] = None) -> None:
+        """
+        Add item to queue, or replace the waiting item with the same key.
+
+        Raises:
+            QueueFullError: If the item needs a new slot and the queue is
+                still full (immediately, unless block=True)
+        """
+        key = self._key(item)
+        with self._not_full:
+            if key is not None and key in self._pending:
+                self._pending[key] = item
+                return
+            if not self._has_room():
+                if not block or not self._not_full.wait_for(self._has_room, timeout):
+                    raise QueueFullError(f'queue is full ({self._max_queue_size} items)')
+            if key is None:
+                key = object()  # unique, so it can never collide
+            self._pending[key] = item
+            self._order.append(key)
+            self._not_empty.notify()
+
+    def pop(self, block: bool = False, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        Remove and return item from queue, or None if empty.
+
+        With block=True, waits (up to timeout seconds, or indefinitely)
+        for an item instead of returning None straight away.
+        """
+        with self._not_empty:
+            if not self._order:
+                if not block or not self._not_empty.wait_for(lambda: self._order, timeout):
+                    return None
+            item = self._pending.pop(self._order.popleft())
+            self._not_full.notify()
+            return item
+
+    def pop_many(self, max_items: int, block: bool = False, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Remove and return up to max_items items in FIFO order, or [] if empty.
+
+        Takes the lock once for the whole chunk rather than once per item.
+        With block=True, waits (up to timeout seconds, or indefinitely) for
+        at least one item, then returns whatever is waiting at that point.
+        """
+        with self._not_empty:
+            order = self._order
+            if not order:
+                if not block or not self._not_empty.wait_for(lambda: order, timeout):
+                    return []
+            pending_pop, popleft = self._pending.pop, order.popleft
+            items = [pending_pop(popleft()) for _ in range(min(max_items, len(order)))]
+            self._not_full.notify(len(items))
+            return items
+
+    def size(self) -> int:
+        """Return current queue size."""
+        return len(self._order)
 
     def is_empty(self) -> bool:
         """Check if queue is empty."""
-        return len(self._items) == 0
+        return not self._order
 
     def is_full(self) -> bool:
-        """Check if queue is full"""
-        return len(self._items) == self._max_queue_size
+        """Check if queue is full (never, when unbounded)"""
+        return not self._has_room()
 
 
 class QueueFullError(Exception):
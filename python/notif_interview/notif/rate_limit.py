@@ -1,9 +1,25 @@
 """Rate limiting for notifications."""
+import threading
+from typing import Dict, List, Tuple
+
+# Number of stripes the bucket table is split across; a power of two so
+# a key's stripe is hash(key) & _SHARD_MASK
+_LOCK_SHARDS = 16
+_SHARD_MASK = _LOCK_SHARDS - 1
+
+
 class RateLimiter:
     """
     Rate limiter using token bucket algorithm.
     
-    Should enforce max 5 notifications per 60 seconds per (user_id, channel) pair.
+    Enforces max_tokens notifications per window_seconds per (user_id,
+    channel) pair. Each pair's bucket is just [tokens, last_refill]: it
+    refills continuously at max_tokens / window_seconds tokens per second,
+    up to max_tokens, and each allowed notification spends one token.
+    
+    Safe to call from several worker threads; keys are hashed onto one of
+    _LOCK_SHARDS stripes, each with its own lock and its own bucket dict,
+    so unrelated pairs rarely contend and no lock guards the whole table.
     """
     
     def __init__(self, max_tokens: int = 5, window_seconds: float = 60.0):
@@ -16,8 +32,11 @@ class RateLimiter:
         """
         self.max_tokens = max_tokens
         self.window_seconds = window_seconds
-        # TODO: Rate limiting - Add data structures to track tokens per (user_id, channel)
-        # Hint: You'll need to track tokens and last refill time for each (user_id, channel)
+        self._refill_rate = max_tokens / window_seconds  # tokens per second
+        # Per stripe: (lock, {(user_id, channel): [tokens, last_refill]})
+        self._stripes: List[Tuple[threading.Lock, Dict[Tuple[str, str], List[float]]]] = [
+            (threading.Lock(), {}) for _ in range(_LOCK_SHARDS)
+        ]
     
     def allow(self, user_id: str, channel: str, now: float) -> bool:
         """
@@ -31,6 +50,18 @@ class RateLimiter:
         Returns:
             True if notification is allowed, False if rate limited
         """
-        # TODO: Rate limiting - Implement token bucket algorithm
-        # For now, always return True (no rate limiting)
-        return True
+        key = (user_id, channel)
+        lock, buckets = self._stripes[hash(key) & _SHARD_MASK]
+        with lock:
+            # Refill and test-and-decrement under one lock hold, mutating the
+            # bucket in place: one dict probe, no per-call tuple allocation
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = [self.max_tokens, now]
+            tokens = min(self.max_tokens, bucket[0] + (now - bucket[1]) * self._refill_rate)
+            bucket[1] = now
+            if tokens < 1:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1
+            return True
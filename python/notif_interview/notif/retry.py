@@ -1,4 +1,6 @@
 """Retry policy for failed notifications."""
+import random
+from typing import Optional
 
 
 class RetryPolicy:
@@ -8,16 +10,31 @@ class RetryPolicy:
     Should retry up to max_attempts with exponentially increasing delays.
     """
     
-    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0):
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 1.0,
+        max_delay: Optional[float] = None,
+        jitter: float = 0.0,
+    ):
         """
         Initialize retry policy.
         
         Args:
             max_attempts: Maximum number of retry attempts
             base_delay: Base delay in seconds (for exponential backoff: base * 2^attempt)
+            max_delay: Cap on any single delay; None means uncapped
+            jitter: Upper bound of the random seconds backoff() adds to a delay
         """
         self.max_attempts = max_attempts
         self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        # The schedule is fixed, so build it once: base, 2*base, 4*base, ...
+        delays = (base_delay * (1 << i) for i in range(max(1, max_attempts)))
+        if max_delay is not None:
+            delays = (min(delay, max_delay) for delay in delays)
+        self._delays = tuple(delays)
     
     def next_delay(self, attempt: int) -> float:
         """
@@ -27,9 +44,25 @@ class RetryPolicy:
             attempt: Current attempt number (0-indexed)
         
         Returns:
-            Delay in seconds before next retry
-            Should implement exponential backoff: 1s, 2s, 4s for attempts 0, 1, 2
+            Delay in seconds before next retry: base_delay * 2^attempt,
+            e.g. 1s, 2s, 4s for attempts 0, 1, 2. Attempts past the end of
+            the table reuse the last (largest) delay. Never exceeds max_delay.
         """
-        # TODO: Retry - Implement exponential backoff
-        # For now, return 0 (no delay)
-        return 0.0
+        delays = self._delays
+        return delays[attempt] if attempt < len(delays) else delays[-1]
+    
+    def backoff(self, attempt: int) -> float:
+        """
+        Calculate the delay to actually wait before the next retry attempt.
+        
+        Args:
+            attempt: Current attempt number (0-indexed)
+            
+        Returns:
+            next_delay(attempt) plus up to `jitter` random seconds, so
+            events that failed together don't all retry at the same instant
+        """
+        delay = self.next_delay(attempt)
+        if self.jitter:
+            delay += random.random() * self.jitter
+        return delay
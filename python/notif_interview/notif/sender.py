@@ -1,5 +1,5 @@
 """Notification sender with configurable failure modes."""
-from typing import Dict
+from typing import Dict, List
 from notif.models import Notification, DeliveryResult
 
 
@@ -40,3 +40,13 @@ class NotificationSender:
         message = notification.to_message()
         # In real implementation, would actually send via API
         return DeliveryResult(ok=True, reason='')
+    
+    def send_batch(self, notifications: List[Notification]) -> List[DeliveryResult]:
+        """
+        Send several notifications in one call.
+        
+        Returns one DeliveryResult per notification, in order. This fake
+        sends them one by one; a real sender would use its provider's bulk
+        API to pay the per-request overhead once per batch.
+        """
+        return [self.send(notification) for notification in notifications]
@@ -1,18 +1,40 @@
 """Main notification service."""
-from typing import Optional, Set
-from notif.models import Event, EmailNotification, SMSNotification
-from notif.queueing import InMemoryQueue, QueueFullError
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Set, Tuple, Type, Union
+from notif.models import Event, Notification, registered_notifications
+from notif.queueing import DedupWorkQueue, QueueFullError
 from notif.sender import NotificationSender
 from notif.rate_limit import RateLimiter
 from notif.retry import RetryPolicy
 
 
+# Queued once per worker by stop(); FIFO order means it lands after all real events
+_SHUTDOWN = object()
+
+# Most events a worker drains from the queue and sends in one batch
+_SEND_BATCH_SIZE = 64
+
+# How often (in real seconds) an idle worker wakes to check for due retries
+_RETRY_POLL_INTERVAL = 0.05
+
+
+def _coalescing_key(item):
+    """Queue key for an item: duplicate events share their id, sentinels never coalesce."""
+    return item.id if isinstance(item, Event) else None
+
+
 class FakeClock:
     """
     Fake clock for testing without real time.sleep().
     Allows tests to advance time deterministically.
     """
 
+    __slots__ = ('_current_time',)
+
     def __init__(self, start_time: float = 0.0):
         self._current_time = start_time
 
@@ -33,8 +55,16 @@ class NotificationService:
     """
     Service that processes events and sends notifications.
 
-    Current implementation is single-threaded and naive.
-    Needs to be extended for production use.
+    start() launches `workers` long-lived threads that block on the queue
+    and process events as they arrive; stop() queues one shutdown sentinel
+    per worker behind any pending events and joins the threads, so
+    nothing already enqueued is lost. process_once() processes a single
+    event on the calling thread, for deterministic single-threaded use.
+
+    A failed send is not retried inline: the event is scheduled to run
+    again once retry_policy.backoff() has elapsed on the service clock, so
+    a FakeClock drives the whole backoff and no worker ever sleeps on a
+    failing event. Due retries are processed ahead of new events.
     """
 
     def __init__(
@@ -45,6 +75,7 @@ class NotificationService:
         clock: Optional[FakeClock] = None,
         workers: int = 1,
         max_queue_size: Optional[int] = None,
+        dedup_capacity: int = 100_000,
     ):
         """
         Initialize notification service.
@@ -53,28 +84,63 @@ class NotificationService:
             sender: NotificationSender instance
             rate_limiter: RateLimiter instance
             retry_policy: RetryPolicy instance
-            clock: FakeClock instance for testing
-            workers: Number of worker threads (TODO: not implemented yet)
-            max_queue_size: Maximum queue size (TODO: not implemented yet)
+            clock: FakeClock instance for testing; None reads time.monotonic()
+            workers: Number of worker threads started by start()
+            max_queue_size: Maximum queue size; None means unbounded
+            dedup_capacity: Most delivered event ids remembered for dedup;
+                the least recently seen are forgotten first
         """
         self.sender = sender or NotificationSender()
         self.rate_limiter = rate_limiter or RateLimiter()
         self.retry_policy = retry_policy or RetryPolicy()
-        self.clock = clock or FakeClock()
+        self.clock = clock
+        # The hot paths call _now() directly: the clock's bound now(), or
+        # time.monotonic itself in production, with no wrapper object at all
+        self._now = clock.now if clock is not None else time.monotonic
         self.workers = workers
         self.max_queue_size = max_queue_size
+        self.dedup_capacity = dedup_capacity
 
-        self._queue = InMemoryQueue(max_queue_size)
+        # Re-enqueueing an event id that is still waiting replaces it in place
+        self._queue = DedupWorkQueue(max_queue_size, key=_coalescing_key)
+        self._rejected = 0  # Events refused because the queue was full
         self._running = False
-        self._delivered: Set[str] = set()  # Track delivered event IDs
+        self._threads: List[threading.Thread] = []
+        # Channel -> Notification factory, seeded from the module-level classes;
+        # _dispatch is its bound get(), so a lookup is a single call
+        self._registry: Dict[str, Callable[[Event], Notification]] = registered_notifications()
+        self._dispatch = self._registry.get
+        # Dedup by event.id: an id is in _inflight while a worker owns it and
+        # moves to _delivered once sent; both, and the delivery count, are
+        # only touched under the lock. _delivered is an LRU (keys only) capped
+        # at dedup_capacity, so memory stays bounded in a long-running service
+        self._dedup_lock = threading.Lock()
+        self._delivered: 'OrderedDict[str, None]' = OrderedDict()
+        self._inflight: Set[str] = set()
+        self._delivered_count = 0
+        # Retry schedule: a heap of (due_time, seq, event), plus the number of
+        # failed attempts per event id still being retried
+        self._retry_lock = threading.Lock()
+        self._retries: List[Tuple[float, int, Event]] = []
+        self._retry_seq = itertools.count()
+        self._attempts: Dict[str, int] = {}
+
+    def register_notification_type(
+        self, channel: str, cls: Union[Type[Notification], Callable[[Event], Notification]]
+    ) -> None:
+        """
+        Register the Notification class this service builds for a channel.
 
-        # TODO: Dedup - Add tracking for in-flight and completed events
-        # to prevent duplicate sends of same event.id
-        self._delivered_events = {}
-        self._inflight_events = {}
+        Only affects this service; use notif.models.register_notification()
+        to add a channel for every service created afterwards.
 
-        # TODO: Concurrency - Add worker threads/tasks here
-        # Replace single-threaded process_once() with worker pool
+        Args:
+            channel: Channel name, as found in Event.channel
+            cls: Notification subclass to build for events on that channel,
+                or any callable (e.g. a functools.partial) taking the event
+                and returning a Notification
+        """
+        self._registry[channel] = cls
 
     def enqueue(self, event: Event) -> None:
         """
@@ -84,92 +150,227 @@ class NotificationService:
             event: Event to process
 
         Raises:
-            QueueFullError: If queue is at max_queue_size (TODO: not implemented)
+            QueueFullError: If queue is at max_queue_size
         """
-        # TODO: Backpressure - Check max_queue_size and raise QueueFullError if full
-        if self._queue.is_empty() or not self._queue.is_full():
+        # The queue checks capacity and appends atomically; no is_full() pre-check
+        try:
             self._queue.push(event)
-        elif self._queue.is_full():
-            raise QueueFullError
+        except QueueFullError:
+            self._rejected += 1
+            raise
 
     def start(self) -> None:
         """
-        Start the notification service.
+        Start the worker threads and return immediately.
 
-        TODO: Concurrency - Start worker threads/tasks here
-        Currently does nothing as processing happens in process_once()
+        Events already in the queue, and any enqueued later, are picked up
+        by the workers in the background. Calling start() on a running
+        service does nothing.
         """
+        if self._running:
+            return
         self._running = True
-        # TODO: Concurrency - Launch worker pool herefrom concurrent.futures import ThreadPoolExecutor
-        from concurrent.futures import ThreadPoolExecutor
-
-        with ThreadPoolExecutor(max_workers=self._workers) as executor:
-            futures = []
-            for event in self._queue:
-                futures.append(executor.submit(self.process_once()))
-                self._inflight_events += event.id
-
-            for future in futures:
-                print(future.result())
-                self._events_sent += event.id
-
-    def stop(self) -> None:
+        self._threads = [
+            threading.Thread(target=self._worker_loop, name=f'notif-worker-{i}', daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
         """
         Stop the notification service gracefully.
 
-        TODO: Concurrency - Implement graceful shutdown
-        - Wait for in-flight work to complete
-        - Don't lose enqueued items
-        - Complete within reasonable time (<1s in tests)
+        Queues one shutdown sentinel per worker behind everything already
+        enqueued, then joins the workers: pending events are processed,
+        in-flight sends complete, and nothing enqueued before stop() is lost.
+        Retries that are not yet due stay scheduled for process_once() or
+        the next start().
+
+        Args:
+            timeout: Maximum seconds to wait for each worker; None waits
+                until the queue is drained
         """
+        if not self._running:
+            return
         self._running = False
-        # TODO: Concurrency - Signal workers to stop and wait for completion
+        for _ in self._threads:
+            # Block rather than fail if a bounded queue is momentarily full
+            self._queue.push(_SHUTDOWN, block=True)
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _worker_loop(self) -> None:
+        """
+        Process events from the queue until a shutdown sentinel arrives.
 
-    def process_once(self, event) -> bool:
+        Takes any retries that are due, then drains up to _SEND_BATCH_SIZE
+        events in total from the queue with one pop_many() call (blocking
+        for the first one only if there were no retries), and processes
+        them as one batch. While retries are pending the wait is bounded
+        by _RETRY_POLL_INTERVAL so they go out once due.
+        """
+        queue = self._queue
+        pop_many = queue.pop_many
+        process_batch = self._process_batch
+        take_due_retries = self._take_due_retries
+        while True:
+            # Leave room for at least one queued event in the batch
+            events: List[Event] = take_due_retries(_SEND_BATCH_SIZE - 1)
+            timeout = _RETRY_POLL_INTERVAL if self._retries else None
+            items = pop_many(_SEND_BATCH_SIZE - len(events), block=not events, timeout=timeout)
+            shutdowns = 0
+            for item in items:
+                if item is _SHUTDOWN:
+                    shutdowns += 1
+                else:
+                    events.append(item)
+            if events:
+                process_batch(events)
+            if shutdowns:
+                # A chunk can hold other workers' sentinels too; hand those back
+                for _ in range(shutdowns - 1):
+                    queue.push(_SHUTDOWN, block=True)
+                return
+
+    def process_once(self) -> bool:
         """
-        Process one event from queue (single-threaded, naive implementation).
+        Process one due retry, or else one event from the queue, on the
+        calling thread.
 
         Returns:
-            True if an event was processed, False if queue was empty
-
-        TODO: Concurrency - This method should be replaced with worker pool
-        Currently used for simple single-threaded testing
+            True if an event was processed, False if there was nothing to do
         """
-        event = self._queue.pop()
+        due = self._take_due_retries(1)
+        event = due[0] if due else self._queue.pop()
         if event is None:
             return False
+        self._process_batch([event])
+        return True
 
-        # TODO: Dedup - Check if event.id already processed
-        # If already delivered, skip it
-        if event.id in self._delivered_events or event.id in self._inflight_events:
-            return True
-
-        # Create notification based on channel
-        # TODO: Factory - Replace this hardcoded mapping with factory pattern
-        if event.channel == 'email':
-            notification = EmailNotification(event)
-        elif event.channel == 'sms':
-            notification = SMSNotification(event)
-        else:
-            # Unknown channel, skip
-            return True
-
-        # TODO: Rate limiting - Check rate limiter before sending
-        # If rate limited, record delivery result with reason='rate_limited'
-        now = self.clock.now()
-        if not self.rate_limiter.allow(event.user_id, event.channel, now):
-            # Rate limited - should record this
-            return True
-
-        # TODO: Retry - Implement retry logic with exponential backoff
-        # Currently just tries once
-        result = self.sender.send(notification)
-
-        if result.ok:
-            self._delivered.add(event.id)
+    def _take_due_retries(self, limit: int) -> List[Event]:
+        """
+        Remove and return up to `limit` retries whose backoff has elapsed.
 
-        return True
+        Args:
+            limit: Most events to return
+
+        Returns:
+            Due events, earliest first
+        """
+        if not self._retries:
+            return []
+        now = self._now()
+        due: List[Event] = []
+        with self._retry_lock:
+            retries = self._retries
+            while retries and retries[0][0] <= now and len(due) < limit:
+                due.append(heapq.heappop(retries)[2])
+        return due
+
+    def _schedule_retries(self, failed: List[Event], now: float) -> None:
+        """
+        Schedule failed events for another attempt after their backoff.
+
+        Events that have used up retry_policy.max_attempts are dropped.
+
+        Args:
+            failed: Events whose send just failed
+            now: Clock time of the failed batch
+        """
+        policy = self.retry_policy
+        with self._retry_lock:
+            attempts = self._attempts
+            for event in failed:
+                count = attempts.get(event.id, 0) + 1
+                if count >= policy.max_attempts:
+                    # Out of attempts: give up on this event
+                    attempts.pop(event.id, None)
+                    continue
+                attempts[event.id] = count
+                due = now + policy.backoff(count - 1)
+                heapq.heappush(self._retries, (due, next(self._retry_seq), event))
+
+    def _process_batch(self, events: List[Event]) -> None:
+        """
+        Deduplicate, rate limit and send a batch of events.
+
+        Event ids are claimed and released under one lock hold each, and
+        the surviving notifications go out in a single sender.send_batch()
+        call. Events on an unknown channel, or whose (user_id, channel)
+        pair is rate limited, are skipped; rate-limited events are dropped
+        silently, with no delivery result recorded. Retries were already
+        admitted by the rate limiter and don't spend another token. Events
+        whose send fails are handed to _schedule_retries(). The clock is
+        read once for the whole batch; every rate-limit check and retry
+        deadline in it uses that timestamp.
+
+        Args:
+            events: Events to process, in queue order
+        """
+        claimed: List[Event] = []
+        claim = claimed.append
+        with self._dedup_lock:
+            delivered, inflight = self._delivered, self._inflight
+            mark_inflight = inflight.add
+            for event in events:
+                event_id = event.id
+                if event_id in delivered:
+                    # Duplicate of a recent delivery: keep its id fresh
+                    delivered.move_to_end(event_id)
+                    continue
+                if event_id in inflight:
+                    continue
+                mark_inflight(event_id)
+                claim(event)
+
+        sent: List[str] = []
+        failed: List[Event] = []
+        now = self._now()
+        try:
+            # Everything the per-event loop touches, bound to locals once
+            dispatch = self._dispatch
+            allow = self.rate_limiter.allow
+            attempts = self._attempts
+            notifications: List[Notification] = []
+            add_notification = notifications.append
+            for event in claimed:
+                # Create notification based on channel: one pre-bound dict lookup
+                factory = dispatch(event.channel)
+                if factory is None:
+                    # Unknown channel, skip
+                    continue
+                if event.id not in attempts and not allow(event.user_id, event.channel, now):
+                    continue
+                add_notification(factory(event))
+            if notifications:
+                results = self.sender.send_batch(notifications)
+                for notification, result in zip(notifications, results):
+                    if result.ok:
+                        sent.append(notification.event.id)
+                    else:
+                        failed.append(notification.event)
+        finally:
+            with self._dedup_lock:
+                self._inflight.difference_update(event.id for event in claimed)
+                delivered = self._delivered
+                # Claimed ids were not in _delivered, so these append at the end
+                delivered.update(dict.fromkeys(sent))
+                for _ in range(len(delivered) - self.dedup_capacity):
+                    delivered.popitem(last=False)
+                self._delivered_count += len(sent)
+        if failed:
+            self._schedule_retries(failed, now)
+        if sent and self._attempts:
+            with self._retry_lock:
+                for event_id in sent:
+                    self._attempts.pop(event_id, None)
 
     def get_delivered_count(self) -> int:
         """Get count of successfully delivered notifications."""
-        return len(self._delivered)
+        return self._delivered_count
+
+    def get_rejected_count(self) -> int:
+        """Get count of events rejected by enqueue() because the queue was full."""
+        return self._rejected
@@ -0,0 +1,41 @@
+"""Tests for the asyncio-driven notification service."""
+import asyncio
+
+import pytest
+
+from notif.async_service import AsyncNotificationService
+from notif.models import Event
+from notif.queueing import QueueFullError
+from notif.service import FakeClock
+from notif.sender import NotificationSender
+
+
+def test_async_workers_deliver_everything_before_aclose_returns():
+    """
+    Test that worker tasks deliver all queued events and that aclose()
+    waits for them, with duplicates still delivered only once.
+    """
+    async def scenario():
+        service = AsyncNotificationService(
+            sender=NotificationSender(),
+            clock=FakeClock(),
+            workers=4,
+            max_queue_size=50
+        )
+        for i in range(50):
+            service.enqueue(Event(
+                id=f'event_{i % 40}',  # 10 duplicate ids
+                user_id=f'user_{i}',
+                channel='sms',
+                payload={'text': f'Message {i}'}
+            ))
+        with pytest.raises(QueueFullError):
+            service.enqueue(Event(id='overflow', user_id='user_x', channel='sms', payload={}))
+        
+        service.start()
+        await service.aclose()
+        return service
+    
+    service = asyncio.run(scenario())
+    assert service.get_delivered_count() == 40
+    assert service.get_rejected_count() == 1
@@ -1,5 +1,14 @@
 """Tests for OOP extensibility via factory/registry pattern."""
-from notif.models import Event, Notification, DeliveryResult
+import notif.models
+from notif.models import (
+    Event,
+    Notification,
+    DeliveryResult,
+    EmailNotification,
+    SMSNotification,
+    register_notification,
+    registered_notifications,
+)
 from notif.service import NotificationService, FakeClock
 from notif.sender import NotificationSender
 
@@ -27,11 +36,9 @@ def test_add_new_notification_type_via_registry():
     sender = NotificationSender()
     service = NotificationService(sender=sender, clock=clock, workers=1)
     
-    # TODO: Service should have a method like register_notification_type()
-    # or a factory that can be extended
-    # Example API: service.register_notification_type('push', PushNotification)
+    # Register the new channel on this service only
+    service.register_notification_type('push', PushNotification)
     
-    # For now, this will fail because 'push' channel is not recognized
     event = Event(
         id='push_event_1',
         user_id='user_1',
@@ -42,12 +49,11 @@ def test_add_new_notification_type_via_registry():
     service.process_once()
     
     # Should be delivered successfully
-    # Currently fails because service doesn't recognize 'push' channel
     assert service.get_delivered_count() == 1, \
         'Push notification should be delivered after registering new type'
 
 
-def test_factory_pattern_extensibility():
+def test_factory_pattern_extensibility(monkeypatch):
     """
     Test that notification factory allows extension without modifying core service.
     
@@ -55,15 +61,17 @@ def test_factory_pattern_extensibility():
     - Need to implement factory pattern in models.py
     - Need to refactor service.py to use factory instead of hardcoded if/else
     """
+    # Work on a copy of the module-level factory, so 'push' doesn't leak
+    # into other tests
+    monkeypatch.setattr(notif.models, '_FACTORY', registered_notifications())
+    
+    # Register custom notification type for every service created from now on
+    register_notification('push', PushNotification)
+    
     clock = FakeClock()
     sender = NotificationSender()
     service = NotificationService(sender=sender, clock=clock, workers=1)
     
-    # Register custom notification type
-    # TODO: Implement something like:
-    # from notif.models import NotificationFactory
-    # NotificationFactory.register('push', PushNotification)
-    
     # Create events for different channels
     events = [
         Event(
@@ -125,9 +133,8 @@ def test_multiple_custom_notification_types():
     service = NotificationService(sender=sender, clock=clock, workers=1)
     
     # Register multiple custom types
-    # TODO: Implement registration API
-    # service.register_notification_type('slack', SlackNotification)
-    # service.register_notification_type('webhook', WebhookNotification)
+    service.register_notification_type('slack', SlackNotification)
+    service.register_notification_type('webhook', WebhookNotification)
     
     events = [
         Event(
@@ -190,3 +197,41 @@ def test_factory_preserves_existing_channels():
     # Both existing channels should work
     assert service.get_delivered_count() == 2, \
         f'Expected 2 delivered (existing channels), got {service.get_delivered_count()}'
+
+
+def test_service_registration_is_per_service():
+    """
+    Test that register_notification_type() only extends the service it is called on.
+    
+    A second service built afterwards still skips 'push' events.
+    """
+    clock = FakeClock()
+    service = NotificationService(sender=NotificationSender(), clock=clock, workers=1)
+    other = NotificationService(sender=NotificationSender(), clock=clock, workers=1)
+    service.register_notification_type('push', PushNotification)
+    
+    for svc in (service, other):
+        svc.enqueue(Event(
+            id='push_1',
+            user_id='user_1',
+            channel='push',
+            payload={'title': 'Hi', 'body': 'There'}
+        ))
+        svc.process_once()
+    
+    assert service.get_delivered_count() == 1
+    assert other.get_delivered_count() == 0, 'push was registered on the first service only'
+
+
+def test_registered_notifications_is_a_snapshot():
+    """
+    Test that registered_notifications() returns a copy of the channel registry.
+    
+    It lists the built-in channels, and changing it leaves the registry alone.
+    """
+    snapshot = registered_notifications()
+    assert snapshot['email'] is EmailNotification
+    assert snapshot['sms'] is SMSNotification
+    
+    snapshot['push'] = PushNotification
+    assert 'push' not in registered_notifications()
@@ -0,0 +1,55 @@
+"""Tests for DedupWorkQueue.pop_many()."""
+import threading
+
+import pytest
+
+from notif.queueing import DedupWorkQueue, QueueFullError
+
+
+def test_pop_many_returns_fifo_chunks_with_coalescing():
+    """
+    Test that pop_many() drains up to max_items in FIFO order.
+    
+    A coalesced push keeps its key's original position but carries the
+    latest item.
+    """
+    queue = DedupWorkQueue(key=lambda item: item[0])
+    for item in [('a', 1), ('b', 1), ('c', 1), ('a', 2), ('d', 1)]:
+        queue.push(item)
+    
+    assert queue.pop_many(3) == [('a', 2), ('b', 1), ('c', 1)]
+    assert queue.pop_many(3) == [('d', 1)]
+    assert queue.pop_many(3) == []
+    assert queue.is_empty()
+
+
+def test_pop_many_frees_room_in_a_bounded_queue():
+    """Test that items taken by pop_many() free their slots for new pushes."""
+    queue = DedupWorkQueue(max_queue_size=2)
+    queue.push('a')
+    queue.push('b')
+    with pytest.raises(QueueFullError):
+        queue.push('c')
+    
+    assert queue.pop_many(2) == ['a', 'b']
+    queue.push('c')
+    queue.push('d')
+    assert queue.size() == 2
+
+
+def test_pop_many_blocks_until_an_item_arrives():
+    """
+    Test pop_many(block=True).
+    
+    With a timeout and nothing pushed it returns []; otherwise it wakes
+    for an item pushed by another thread.
+    """
+    queue = DedupWorkQueue()
+    assert queue.pop_many(10, block=True, timeout=0.01) == []
+    
+    pusher = threading.Timer(0.02, queue.push, args=('late',))
+    pusher.start()
+    try:
+        assert queue.pop_many(10, block=True, timeout=5.0) == ['late']
+    finally:
+        pusher.join()
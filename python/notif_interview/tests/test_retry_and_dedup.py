@@ -226,3 +226,33 @@ def test_deduplication_different_event_ids():
     # Both should be delivered (different IDs)
     assert service.get_delivered_count() == 2, \
         f'Expected 2 deliveries (different IDs), got {service.get_delivered_count()}'
+
+
+def test_deduplication_window_is_bounded():
+    """
+    Test that only the most recent dedup_capacity delivered ids are remembered.
+    """
+    clock = FakeClock()
+    sender = NotificationSender()
+    service = NotificationService(sender=sender, clock=clock, workers=1, dedup_capacity=2)
+    
+    def deliver(event_id):
+        service.enqueue(Event(
+            id=event_id,
+            user_id=f'user_{event_id}',
+            channel='email',
+            payload={'subject': 'Test', 'body': 'Hello'}
+        ))
+        service.process_once()
+    
+    for event_id in ('a', 'b', 'c'):
+        deliver(event_id)
+    assert service.get_delivered_count() == 3
+    
+    # 'c' is still remembered, so it is deduplicated
+    deliver('c')
+    assert service.get_delivered_count() == 3, 'Recent duplicate should be skipped'
+    
+    # 'a' was evicted once 'c' was delivered, so it goes out again
+    deliver('a')
+    assert service.get_delivered_count() == 4, 'Evicted id should be delivered again'
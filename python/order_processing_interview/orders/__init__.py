@@ -3,10 +3,12 @@
 from .models import Order, Receipt, OrderStatus
 from .gateway import PaymentGateway, FakeGateway
 from .inventory import Inventory
-from .queueing import InMemoryJobQueue, Job
+from .queueing import InMemoryJobQueue, Job, QueueFullError
 from .idempotency import IdempotencyStore
-from .clock import FakeClock
+from .clock import Clock, FakeClock, SystemClock
+from .retry import RetryPolicy
 from .worker import Worker
+from .async_worker import AsyncWorker
 from .service import CheckoutService
 
 
@@ -19,8 +21,13 @@ __all__ = [
     'Inventory',
     'InMemoryJobQueue',
     'Job',
+    'QueueFullError',
     'IdempotencyStore',
+    'Clock',
     'FakeClock',
+    'SystemClock',
+    'RetryPolicy',
     'Worker',
+    'AsyncWorker',
     'CheckoutService',
 ]
@@ -0,0 +1,161 @@
+"""Asyncio worker that runs jobs as tasks on one event loop."""
+
+import asyncio
+import inspect
+from typing import List, Optional
+
+from .clock import Clock
+from .queueing import InMemoryJobQueue, Job
+from .retry import RetryPolicy
+from .worker import Worker, _BATCH_SIZE, _IDLE_POLL_SECONDS
+
+
+class AsyncWorker(Worker):
+    """
+    Worker whose pool is tasks on one event loop instead of threads.
+    
+    start() launches `concurrency` tasks that take jobs from the queue
+    and await their handlers, so while one job waits on the gateway the
+    others keep running. A task costs a coroutine frame rather than a
+    thread stack, and switching between them never leaves user space.
+    Handlers may be coroutine functions, whose result is awaited, or
+    plain functions. Retries and the DLQ behave as in Worker, but backoff
+    is awaited with clock.sleep_async(): a task waiting out a retry
+    leaves the loop free for the others. As in the thread pool, one idle
+    task at a time owns the retry timer and awaits it in slices of at
+    most _IDLE_POLL_SECONDS; the rest keep polling the queue.
+    
+    start() must be called from inside a running event loop, and the
+    pool is shut down with `await aclose()`.
+    """
+    
+    def __init__(
+        self,
+        queue: InMemoryJobQueue,
+        clock: Optional[Clock] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        concurrency: int = 100
+    ):
+        """
+        Initialize worker.
+        
+        Args:
+            queue: Job queue to process from
+            clock: Clock used to schedule and wait out retry backoff
+            retry_policy: Retry limit and backoff schedule
+            concurrency: Number of tasks started by start(), which bounds
+                the jobs in flight at once
+        """
+        super().__init__(queue, clock, retry_policy, worker_count=concurrency)
+        self._tasks: List[asyncio.Task] = []
+    
+    async def process_one_async(self) -> Optional[Job]:
+        """
+        Process jobs until one finishes (succeeds or moves to the DLQ).
+        
+        The coroutine counterpart of process_one(): handlers are awaited,
+        and so is the wait for a retry that isn't due yet.
+        
+        Returns:
+            The job that finished, or None if there was nothing to process
+        """
+        job = self._next_job()
+        while job is not None and not await self._attempt_async(job):
+            await self._wait_for_retry_async()
+            job = self._next_job()
+        return job
+    
+    def process_batch(self, n: int = _BATCH_SIZE) -> List[Job]:
+        """
+        Not supported: batches run handlers synchronously.
+        
+        Raises:
+            NotImplementedError: Always; use process_one_async() or start()
+        """
+        raise NotImplementedError('AsyncWorker runs jobs with process_one_async() or start()')
+    
+    def start(self) -> None:
+        """
+        Start the worker tasks on the running event loop.
+        
+        Calling start() on a running pool does nothing.
+        """
+        if self._tasks:
+            return
+        self._stopping.clear()
+        self._tasks = [asyncio.create_task(self._run_async()) for _ in range(self.worker_count)]
+    
+    async def aclose(self) -> None:
+        """
+        Stop the worker pool gracefully.
+        
+        The tasks finish the jobs already queued, in-flight jobs and their
+        pending retries, then exit.
+        """
+        self._stopping.set()
+        await asyncio.gather(*self._tasks)
+        self._tasks = []
+    
+    async def _run_async(self) -> None:
+        """Task body: process jobs until stopped and out of work."""
+        retry_timer = self._retry_timer
+        while True:
+            job = self._next_job()
+            if job is not None:
+                await self._attempt_async(job)
+                continue
+            # Only ever acquired without blocking, so it never stalls the loop
+            if self._delayed and retry_timer.acquire(blocking=False):
+                try:
+                    await self._wait_for_retry_async(_IDLE_POLL_SECONDS)
+                finally:
+                    retry_timer.release()
+                continue
+            if self._stopping.is_set() and not self._delayed:
+                return
+            # Idle: the queue can't be awaited, so check back shortly
+            await asyncio.sleep(_IDLE_POLL_SECONDS)
+    
+    async def _wait_for_retry_async(self, max_wait: Optional[float] = None) -> None:
+        """
+        Sleep on the clock, without blocking the loop, until the earliest pending retry is due.
+        
+        Args:
+            max_wait: Most seconds to wait, even if the retry isn't due by
+                then; None waits until it is
+        """
+        with self._lock:
+            if not self._delayed:
+                return
+            ready_at = self._delayed[0][0]
+        delay = ready_at - self._now()
+        if max_wait is not None:
+            delay = min(delay, max_wait)
+        if delay > 0:
+            await self.clock.sleep_async(delay)
+    
+    async def _attempt_async(self, job: Job) -> bool:
+        """
+        Run one attempt of a job, awaiting the handler if it is a coroutine.
+        
+        Args:
+            job: Job to run
+            
+        Returns:
+            True if the job is finished (succeeded or dead-lettered),
+            False if it was scheduled for a retry
+        """
+        handlers = self.queue.get_handler(job.job_type)
+        if handlers is None:
+            # Nothing can ever run this job type
+            self.dlq.append(job)
+            return True
+        handler, on_dead_letter = handlers
+        
+        try:
+            done = handler(job)
+            if inspect.isawaitable(done):
+                done = await done
+        except Exception:
+            done = False
+        return self._settle(job, done, on_dead_letter)
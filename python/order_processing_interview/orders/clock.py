@@ -1,4 +1,59 @@
-"""Fake clock for deterministic time-based testing."""
+"""Clocks: the real one, and a fake one for deterministic time-based testing."""
+
+import asyncio
+import time
+from typing import Protocol
+
+
+class Clock(Protocol):
+    """What workers need from a clock: read the time and wait for a while."""
+    
+    def now(self) -> float:
+        """Get current time in seconds."""
+        ...
+    
+    def sleep(self, seconds: float) -> None:
+        """Wait for the given number of seconds."""
+        ...
+    
+    async def sleep_async(self, seconds: float) -> None:
+        """Wait for the given number of seconds without blocking the event loop."""
+        ...
+
+
+class SystemClock:
+    """
+    Real clock: monotonic time, and sleeps that block the calling thread.
+    """
+    
+    __slots__ = ()
+    
+    def now(self) -> float:
+        """
+        Get current time.
+        
+        Returns:
+            time.monotonic() in seconds
+        """
+        return time.monotonic()
+    
+    def sleep(self, seconds: float) -> None:
+        """
+        Block the calling thread for the given number of seconds.
+        
+        Args:
+            seconds: Time to wait in seconds
+        """
+        time.sleep(seconds)
+    
+    async def sleep_async(self, seconds: float) -> None:
+        """
+        Suspend the calling coroutine for the given number of seconds.
+        
+        Args:
+            seconds: Time to wait in seconds
+        """
+        await asyncio.sleep(seconds)
 
 
 class FakeClock:
@@ -7,8 +62,14 @@ class FakeClock:
     
     Enables fast, deterministic testing of time-based logic like
     exponential backoff without actual sleeps.
+    
+    The current time is the public slot `t`: reading clock.t is a single
+    slot access, and now() just returns it for code written against any
+    clock.
     """
     
+    __slots__ = ('t',)
+    
     def __init__(self, start_time: float = 0.0):
         """
         Initialize clock.
@@ -16,7 +77,7 @@ class FakeClock:
         Args:
             start_time: Initial time value in seconds
         """
-        self._current_time = start_time
+        self.t = start_time
     
     def now(self) -> float:
         """
@@ -25,7 +86,7 @@ class FakeClock:
         Returns:
             Current time in seconds
         """
-        return self._current_time
+        return self.t
     
     def tick(self, seconds: float) -> None:
         """
@@ -34,7 +95,27 @@ class FakeClock:
         Args:
             seconds: Amount of time to advance in seconds
         """
-        self._current_time += seconds
+        self.t += seconds
+    
+    def sleep(self, seconds: float) -> None:
+        """
+        Sleep for the given seconds: advances the clock and returns at once.
+        
+        Args:
+            seconds: Amount of time to advance in seconds
+        """
+        self.t += seconds
+    
+    async def sleep_async(self, seconds: float) -> None:
+        """
+        Sleep for the given seconds: advances the clock, then just yields
+        to the event loop once.
+        
+        Args:
+            seconds: Amount of time to advance in seconds
+        """
+        self.t += seconds
+        await asyncio.sleep(0)
     
     def reset(self, time: float = 0.0) -> None:
         """
@@ -43,4 +124,4 @@ class FakeClock:
         Args:
             time: Time to reset to in seconds
         """
-        self._current_time = time
+        self.t = time
@@ -1,13 +1,24 @@
 """Payment gateway interface and fake implementation."""
 
+import asyncio
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict
+from array import array
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Tuple
 
 from .models import Receipt
 
 
 class PaymentGateway(ABC):
-    """Abstract interface for payment processing."""
+    """
+    Abstract interface for payment processing.
+    
+    Declares an empty __slots__ (as ABC itself does) so concrete gateways
+    can declare their own and carry no per-instance __dict__.
+    """
+    
+    __slots__ = ()
     
     @abstractmethod
     def charge(self, order_id: str, amount_cents: int) -> Receipt:
@@ -19,12 +30,60 @@ class PaymentGateway(ABC):
             amount_cents: Amount to charge in cents
             
         Returns:
-            Receipt with charge result
+            Receipt with charge result; charged=False reports a failed
+            attempt without the cost of raising
             
         Raises:
-            Exception: If payment fails
+            Exception: If payment fails and the gateway signals failures
+                by raising rather than through the receipt
         """
         pass
+    
+    async def charge_async(self, order_id: str, amount_cents: int) -> Receipt:
+        """
+        Charge the specified amount for an order without blocking the event loop.
+        
+        Gateways doing real network I/O override this with a non-blocking
+        call; the default runs the blocking charge() in the event loop's
+        default executor, so it never stalls the other tasks.
+        
+        Args:
+            order_id: Unique identifier for the order
+            amount_cents: Amount to charge in cents
+            
+        Returns:
+            Receipt with charge result, as from charge()
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.charge, order_id, amount_cents)
+    
+    def charge_batch(self, items: List[Tuple[str, int]]) -> List[Receipt]:
+        """
+        Charge several orders in one call.
+        
+        Gateways whose API accepts a batch override this with a single
+        request. The default calls charge() per order; one that raises is
+        reported as a failed receipt, so it can't take the others' results
+        down with it.
+        
+        Args:
+            items: (order_id, amount_cents) pairs
+            
+        Returns:
+            One receipt per item, in order
+        """
+        receipts: List[Receipt] = []
+        for order_id, amount_cents in items:
+            try:
+                receipts.append(self.charge(order_id, amount_cents))
+            except Exception as exc:
+                receipts.append(Receipt(
+                    order_id=order_id,
+                    charged=False,
+                    attempt=0,
+                    error_code=type(exc).__name__
+                ))
+        return receipts
 
 
 class FakeGateway(PaymentGateway):
@@ -33,19 +92,63 @@ class FakeGateway(PaymentGateway):
     
     Fails the first N attempts per order_id, then succeeds.
     This enables deterministic testing of retry logic.
+    
+    A failed attempt returns Receipt(charged=False) by default, which
+    skips the exception object and traceback a raise would allocate;
+    pass raise_on_failure=True to raise instead.
     """
     
-    def __init__(self, fail_count_per_order: Dict[str, int] = None):
+    __slots__ = (
+        'fail_count_per_order', 'raise_on_failure', 'charge_count',
+        '_slots', '_attempts', '_remaining', '_slots_lock'
+    )
+    
+    def __init__(self, fail_count_per_order: Dict[str, int] = None, raise_on_failure: bool = False):
         """
         Initialize fake gateway.
         
         Args:
             fail_count_per_order: Dict mapping order_id to number of times 
                                  it should fail before succeeding
+            raise_on_failure: Raise an Exception on a failed attempt instead
+                of returning a receipt with charged=False
         """
         self.fail_count_per_order = fail_count_per_order or {}
-        self.attempt_count: Dict[str, int] = {}
-        self.charge_count: Dict[str, int] = {}
+        self.raise_on_failure = raise_on_failure
+        # defaultdict(int): each increment is a single `d[k] += 1`
+        self.charge_count: DefaultDict[str, int] = defaultdict(int)
+        # Per-order counters live column-wise in unsigned int arrays, four
+        # bytes each, at the order's slot: one dict probe per charge finds
+        # both attempts and failures still to come
+        self._slots: Dict[str, int] = {}
+        self._attempts = array('I')
+        self._remaining = array('I')
+        self._slots_lock = threading.Lock()  # Taken only to add an order's slot
+    
+    @property
+    def attempt_count(self) -> DefaultDict[str, int]:
+        """Number of charge attempts per order_id (a snapshot)."""
+        attempts = self._attempts
+        return defaultdict(int, {order_id: attempts[slot] for order_id, slot in self._slots.items()})
+    
+    def _add_slot(self, order_id: str) -> int:
+        """
+        Give an order its slot in the counter arrays, on its first charge.
+        
+        Args:
+            order_id: Order being charged
+            
+        Returns:
+            The order's slot
+        """
+        with self._slots_lock:
+            slot = self._slots.get(order_id)
+            if slot is None:
+                slot = len(self._attempts)
+                self._attempts.append(0)
+                self._remaining.append(self.fail_count_per_order.get(order_id, 0))
+                self._slots[order_id] = slot
+            return slot
     
     def charge(self, order_id: str, amount_cents: int) -> Receipt:
         """
@@ -53,19 +156,31 @@ class FakeGateway(PaymentGateway):
         
         Fails deterministically based on configuration.
         """
-        # Track attempt count
-        current_attempt = self.attempt_count.get(order_id, 0) + 1
-        self.attempt_count[order_id] = current_attempt
+        slot = self._slots.get(order_id)
+        if slot is None:
+            slot = self._add_slot(order_id)
         
-        # Check if we should fail this attempt
-        fail_count = self.fail_count_per_order.get(order_id, 0)
+        # Track attempt count
+        attempts = self._attempts
+        attempts[slot] += 1
+        current_attempt = attempts[slot]
         
-        if current_attempt <= fail_count:
+        # Fail this attempt if the order has failures left
+        remaining = self._remaining[slot]
+        if remaining:
+            self._remaining[slot] = remaining - 1
             # Simulate transient failure
-            raise Exception(f'Payment gateway error for order {order_id} (attempt {current_attempt})')
+            if self.raise_on_failure:
+                raise Exception(f'Payment gateway error for order {order_id} (attempt {current_attempt})')
+            return Receipt(
+                order_id=order_id,
+                charged=False,
+                attempt=current_attempt,
+                error_code='transient_failure'
+            )
         
         # Success - track that we charged
-        self.charge_count[order_id] = self.charge_count.get(order_id, 0) + 1
+        self.charge_count[order_id] += 1
         
         return Receipt(
             order_id=order_id,
@@ -73,6 +188,16 @@ class FakeGateway(PaymentGateway):
             attempt=current_attempt
         )
     
+    async def charge_async(self, order_id: str, amount_cents: int) -> Receipt:
+        """
+        Simulate charging payment, yielding to the event loop first.
+        
+        The yield stands in for the network round trip, so concurrent
+        charges interleave the way real ones would.
+        """
+        await asyncio.sleep(0)
+        return self.charge(order_id, amount_cents)
+    
     def get_charge_count(self, order_id: str) -> int:
         """Get number of successful charges for an order."""
         return self.charge_count.get(order_id, 0)
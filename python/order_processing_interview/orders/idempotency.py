@@ -1,52 +1,166 @@
 """Idempotency store to prevent duplicate processing."""
 
-from typing import Set
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from typing import List, Set
+
+
+# Default number of independently locked shards the store is split into
+_SHARDS = 32
+
+
+class _Shard:
+    """One shard of an IdempotencyStore: its own Bloom bits, LRU, in-flight claims and lock."""
+    
+    __slots__ = ('bits', 'bit_inserts', 'lru', 'inflight', 'lock')
+    
+    def __init__(self, num_bits: int):
+        self.bits = bytearray((num_bits + 7) // 8)
+        # Inserts since the bits were last rebuilt from the LRU contents
+        self.bit_inserts = 0
+        self.lru: 'OrderedDict[str, None]' = OrderedDict()
+        # order_ids claimed by a worker that is charging them right now
+        self.inflight: Set[str] = set()
+        self.lock = threading.Lock()
 
 
 class IdempotencyStore:
     """
-    Tracks processed orders to prevent duplicate charges.
+    Tracks processed orders to prevent duplicate charges, in bounded memory.
+    
+    Two tiers: a fixed-size Bloom filter answers "definitely not processed"
+    without touching any Python objects, and an LRU of the most recent
+    order_ids confirms the filter's "maybe" exactly. Memory is capped at
+    the bit array plus `capacity` keys; an order_id that has aged out of
+    the LRU is forgotten, which only matters for duplicates arriving after
+    `capacity` newer orders.
     
-    TODO: Implement actual idempotency logic.
-    Currently this is a stub that does nothing.
+    Both tiers are split into `shards` shards, each with its own lock, and
+    an order_id always maps to shard hash(order_id) % shards. Workers
+    marking different orders therefore rarely wait on each other. Each
+    shard holds an equal share of `capacity` and evicts its own least
+    recently used keys, so with more than one shard eviction order is LRU
+    per shard rather than across the whole store.
     
-    Requirements:
-    - Thread-safe operations
-    - Record when an order has been processed
-    - Check if an order has already been processed
-    - Prevent race conditions (atomic check-and-set)
+    mark_processed() is an atomic check-and-set under its shard's lock;
+    is_processed() reads without locking. claim() is the check a worker
+    makes before charging: under the same lock it refuses an order that
+    is processed or already claimed, so two workers holding duplicate
+    jobs can't both charge it. The claimant calls release() once its
+    attempt is over, after mark_processed() if the charge went through.
     """
     
-    def __init__(self):
-        """Initialize empty store."""
-        self._processed: Set[str] = set()
+    def __init__(
+        self,
+        capacity: int = 1_000_000,
+        false_positive_rate: float = 0.01,
+        shards: int = _SHARDS
+    ):
+        """
+        Initialize empty store.
+        
+        Args:
+            capacity: Most order_ids remembered; older ones are evicted first
+            false_positive_rate: Target Bloom filter false-positive rate at
+                capacity (a false positive costs one extra LRU probe)
+            shards: Number of independently locked shards; capped at capacity
+        """
+        self.capacity = capacity
+        self.false_positive_rate = false_positive_rate
+        self.shards = max(1, min(shards, capacity))
+        self._shard_capacity = math.ceil(capacity / self.shards)
+        per_shard = self._shard_capacity
+        self._num_bits = max(8, math.ceil(-per_shard * math.log(false_positive_rate) / math.log(2) ** 2))
+        self._num_hashes = max(1, round(self._num_bits / per_shard * math.log(2)))
+        self._shards = [_Shard(self._num_bits) for _ in range(self.shards)]
+    
+    def _positions(self, order_id: str) -> List[int]:
+        """Bit positions for a key: one 128-bit blake2b digest, double hashing."""
+        digest = hashlib.blake2b(order_id.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        num_bits = self._num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self._num_hashes)]
+    
+    def _set_bits(self, bits: bytearray, order_id: str) -> None:
+        for pos in self._positions(order_id):
+            bits[pos >> 3] |= 1 << (pos & 7)
     
     def is_processed(self, order_id: str) -> bool:
         """
         Check if an order has been processed.
         
-        TODO: Implement thread-safe check
-        
         Args:
             order_id: Order ID to check
             
         Returns:
             True if already processed, False otherwise
         """
-        # Stub implementation - always returns False
-        return False
+        shard = self._shards[hash(order_id) % self.shards]
+        bits = shard.bits
+        if not all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(order_id)):
+            return False
+        return order_id in shard.lru
     
     def mark_processed(self, order_id: str) -> bool:
         """
         Mark an order as processed.
         
-        TODO: Implement atomic check-and-set
-        
         Args:
             order_id: Order ID to mark as processed
             
         Returns:
             True if this call marked it (first time), False if already marked
         """
-        # Stub implementation - doesn't actually store anything
-        return True
+        shard = self._shards[hash(order_id) % self.shards]
+        with shard.lock:
+            lru = shard.lru
+            if order_id in lru:
+                lru.move_to_end(order_id)
+                return False
+            lru[order_id] = None
+            if len(lru) > self._shard_capacity:
+                lru.popitem(last=False)
+            self._set_bits(shard.bits, order_id)
+            shard.bit_inserts += 1
+            if shard.bit_inserts > self._shard_capacity:
+                # Evicted keys still set bits; rebuild from the live keys so
+                # the false-positive rate stays near its target. Built aside
+                # and swapped in, so lock-free readers never see it half-filled
+                bits = bytearray(len(shard.bits))
+                for key in lru:
+                    self._set_bits(bits, key)
+                shard.bits = bits
+                shard.bit_inserts = len(lru)
+            return True
+    
+    def claim(self, order_id: str) -> bool:
+        """
+        Claim an unprocessed order for the caller to charge.
+        
+        Args:
+            order_id: Order ID to claim
+            
+        Returns:
+            True if the caller now holds the claim, False if the order is
+            already processed or claimed by someone else
+        """
+        shard = self._shards[hash(order_id) % self.shards]
+        with shard.lock:
+            if order_id in shard.lru or order_id in shard.inflight:
+                return False
+            shard.inflight.add(order_id)
+            return True
+    
+    def release(self, order_id: str) -> None:
+        """
+        Give up a claim taken with claim(); releasing an unclaimed order does nothing.
+        
+        Args:
+            order_id: Order ID to release
+        """
+        shard = self._shards[hash(order_id) % self.shards]
+        with shard.lock:
+            shard.inflight.discard(order_id)
@@ -1,13 +1,13 @@
 """Core data models for order processing."""
 
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, Optional
 
 
 OrderStatus = Literal['pending', 'paid', 'failed']
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Represents a customer order."""
     order_id: str
@@ -16,9 +16,10 @@ class Order:
     status: OrderStatus = 'pending'
 
 
-@dataclass
+@dataclass(slots=True)
 class Receipt:
     """Tracks payment processing attempts."""
     order_id: str
     charged: bool
     attempt: int
+    error_code: Optional[str] = None  # Why an attempt with charged=False failed
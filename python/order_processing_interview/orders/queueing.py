@@ -1,62 +1,237 @@
 """In-memory job queue for background processing."""
 
+import threading
 from dataclasses import dataclass
-from typing import Any, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Job:
     """Represents a background job."""
     job_id: str
     job_type: str
     payload: Any
+    attempts: int = 0  # Failed attempts so far; bumped in place on each retry
+
+
+# Runs one attempt of a job: True when it is done, False to retry it. A
+# coroutine function handler (returning an awaitable) needs an AsyncWorker
+JobHandler = Callable[[Job], Union[bool, Awaitable[bool]]]
+# Called once a job has exhausted its retries and moved to the DLQ
+DeadLetterHandler = Callable[[Job], None]
+# Runs the first attempt of several jobs of one type at once: one result
+# per job, in order, each as a JobHandler would return it
+BatchJobHandler = Callable[[List[Job]], List[bool]]
+
+
+class QueueFullError(Exception):
+    """Raised when a job cannot be enqueued because the queue is full."""
+    pass
 
 
 class InMemoryJobQueue:
     """
-    Simple in-memory job queue using a list.
+    Bounded, thread-safe in-memory job queue backed by a ring buffer.
     
-    WARNING: This implementation is not thread-safe and has no bounds.
+    Jobs live in a list preallocated to `capacity` slots and indexed by
+    head/tail counters, so the queue never grows or reallocates and memory
+    stays flat under load. Two semaphores count the free and filled slots
+    (the classic bounded-buffer pattern): push() waits for a free slot,
+    which is the backpressure on producers, and pop() can wait for a
+    filled one. The lock only guards the index bookkeeping.
     
-    TODO: Implement the following for production use:
-    - Thread-safe operations (locks or queue.Queue)
-    - Bounded capacity with backpressure
-    - Blocking/timeout on push when full
-    - Blocking/timeout on pop when empty
+    A push can carry a dedup_key; while a job with that key is waiting,
+    further pushes with the same key are dropped, so a burst of duplicates
+    costs one slot and one run instead of one each.
     """
     
-    def __init__(self):
-        """Initialize empty queue."""
-        self._jobs: List[Job] = []
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize empty queue.
+        
+        Args:
+            capacity: Maximum number of jobs held at once
+        """
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self._buf: List[Optional[Job]] = [None] * capacity
+        # dedup_key of the job in each slot, and the set of keys waiting
+        self._buf_keys: List[Optional[Hashable]] = [None] * capacity
+        self._keys: Set[Hashable] = set()
+        self._head = 0  # Next slot to pop
+        self._tail = 0  # Next slot to push
+        self._size = 0
+        self._lock = threading.Lock()
+        self._empty_slots = threading.Semaphore(capacity)
+        self._filled_slots = threading.Semaphore(0)
+        self._handlers: Dict[str, Tuple[JobHandler, Optional[DeadLetterHandler]]] = {}
+        self._batch_handlers: Dict[str, BatchJobHandler] = {}
     
-    def push(self, job: Job) -> None:
+    def register_handler(
+        self,
+        job_type: str,
+        handler: JobHandler,
+        on_dead_letter: Optional[DeadLetterHandler] = None,
+        batch_handler: Optional[BatchJobHandler] = None
+    ) -> None:
         """
-        Add a job to the queue.
+        Register how workers run jobs of a type.
+        
+        The queue is what producers and workers share, so it carries the
+        handlers; registering a job type again replaces its handlers.
+        
+        Args:
+            job_type: Job type, as found in Job.job_type
+            handler: Runs one attempt; returns True when the job is done
+                and False (or raises) to have it retried. May be a
+                coroutine function if the jobs are run by an AsyncWorker
+            on_dead_letter: Called when the job exhausts its retries
+            batch_handler: Optionally runs the first attempt of a whole
+                batch of jobs in one call (see Worker.process_batch());
+                retries always go through handler
+        """
+        self._handlers[job_type] = (handler, on_dead_letter)
+        if batch_handler is None:
+            self._batch_handlers.pop(job_type, None)
+        else:
+            self._batch_handlers[job_type] = batch_handler
+    
+    def get_handler(self, job_type: str) -> Optional[Tuple[JobHandler, Optional[DeadLetterHandler]]]:
+        """
+        Look up the handlers registered for a job type.
+        
+        Returns:
+            (handler, on_dead_letter), or None for an unregistered type
+        """
+        return self._handlers.get(job_type)
+    
+    def get_batch_handler(self, job_type: str) -> Optional[BatchJobHandler]:
+        """
+        Look up the batch handler registered for a job type.
         
-        TODO: Add bounds checking and backpressure
+        Returns:
+            The batch handler, or None if the type has none
+        """
+        return self._batch_handlers.get(job_type)
+    
+    def push(
+        self,
+        job: Job,
+        block: bool = True,
+        timeout: Optional[float] = None,
+        dedup_key: Optional[Hashable] = None
+    ) -> bool:
+        """
+        Add a job to the queue.
         
         Args:
             job: Job to enqueue
+            block: Wait for a free slot when the queue is full
+            timeout: Maximum seconds to wait; None waits indefinitely
+            dedup_key: Drop the job if one pushed with this key is still
+                waiting; None never deduplicates
+            
+        Returns:
+            True if the job was enqueued, False if it was a duplicate
+            
+        Raises:
+            QueueFullError: If the queue is still full (immediately, unless block=True)
         """
-        self._jobs.append(job)
+        # Checked before taking a slot, so a duplicate never waits on a full queue
+        if dedup_key is not None and dedup_key in self._keys:
+            return False
+        if not self._empty_slots.acquire(block, timeout if block else None):
+            raise QueueFullError(f'job queue is full ({self.capacity} jobs)')
+        with self._lock:
+            # Re-checked under the lock: another producer may have won the race
+            duplicate = dedup_key is not None and dedup_key in self._keys
+            if not duplicate:
+                tail = self._tail
+                self._buf[tail] = job
+                if dedup_key is not None:
+                    self._buf_keys[tail] = dedup_key
+                    self._keys.add(dedup_key)
+                self._tail = (tail + 1) % self.capacity
+                self._size += 1
+        if duplicate:
+            self._empty_slots.release()
+            return False
+        self._filled_slots.release()
+        return True
     
-    def pop(self) -> Optional[Job]:
+    def pop(self, block: bool = False, timeout: Optional[float] = None) -> Optional[Job]:
         """
         Remove and return a job from the queue.
         
-        TODO: Add blocking behavior with timeout
-        
+        Args:
+            block: Wait for a job when the queue is empty
+            timeout: Maximum seconds to wait; None waits indefinitely
+            
         Returns:
             Job if available, None if queue is empty
         """
-        if self._jobs:
-            return self._jobs.pop(0)
-        return None
+        if not self._filled_slots.acquire(block, timeout if block else None):
+            return None
+        with self._lock:
+            head = self._head
+            job = self._buf[head]
+            self._buf[head] = None  # Drop the reference so the job can be freed
+            key = self._buf_keys[head]
+            if key is not None:
+                self._buf_keys[head] = None
+                self._keys.discard(key)
+            self._head = (head + 1) % self.capacity
+            self._size -= 1
+        self._empty_slots.release()
+        return job
+    
+    def pop_batch(self, max_n: int, block: bool = False, timeout: Optional[float] = None) -> List[Job]:
+        """
+        Remove and return up to max_n jobs in FIFO order.
+        
+        The jobs are taken under a single lock hold, so a batch costs one
+        lock round trip instead of one per job.
+        
+        Args:
+            max_n: Most jobs to return
+            block: Wait for at least one job when the queue is empty
+            timeout: Maximum seconds to wait; None waits indefinitely
+            
+        Returns:
+            The jobs, oldest first; empty if the queue is empty
+        """
+        filled = self._filled_slots
+        if max_n < 1 or not filled.acquire(block, timeout if block else None):
+            return []
+        count = 1
+        while count < max_n and filled.acquire(False):
+            count += 1
+        jobs: List[Job] = []
+        with self._lock:
+            buf, buf_keys, keys = self._buf, self._buf_keys, self._keys
+            head, capacity = self._head, self.capacity
+            for _ in range(count):
+                jobs.append(buf[head])
+                buf[head] = None
+                key = buf_keys[head]
+                if key is not None:
+                    buf_keys[head] = None
+                    keys.discard(key)
+                head = (head + 1) % capacity
+            self._head = head
+            self._size -= count
+        self._empty_slots.release(count)
+        return jobs
     
     def size(self) -> int:
         """Return current queue size."""
-        return len(self._jobs)
+        return self._size
     
     def is_empty(self) -> bool:
         """Check if queue is empty."""
-        return len(self._jobs) == 0
+        return self._size == 0
+    
+    def is_full(self) -> bool:
+        """Check if queue is at capacity."""
+        return self._size >= self.capacity
@@ -0,0 +1,67 @@
+"""Retry policy with exponential backoff for failed jobs."""
+
+import random
+from typing import Optional
+
+
+class RetryPolicy:
+    """
+    Exponential backoff schedule for retrying failed jobs.
+    
+    A job gets up to max_retries retries after its first attempt; retry n
+    (0-indexed) waits base_delay * 2**n seconds, capped at max_delay. The
+    schedule never changes, so it is computed once as a tuple and
+    next_delay() is a single index.
+    
+    With jitter > 0 each delay is scaled down by a random fraction of up
+    to `jitter` (0.5 gives delays spread over [d/2, d]), drawn with a
+    single rng.random() call, so jobs that failed together spread their
+    retries out instead of hitting the gateway in lockstep.
+    """
+    
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: float = 0.0,
+        rng: Optional[random.Random] = None
+    ):
+        """
+        Initialize retry policy.
+        
+        Args:
+            max_retries: Retries allowed after the first attempt
+            base_delay: Delay before the first retry, in seconds
+            max_delay: Cap on any single delay, in seconds
+            jitter: Largest fraction (0 to 1) randomly taken off each delay
+            rng: Random source for jitter; pass a seeded random.Random for
+                reproducible delays
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self._random = (rng or random.Random()).random
+        # base, 2*base, 4*base, ... clamped at build time, so a large retry
+        # count can never produce an oversized delay
+        self._delays = tuple(
+            min(base_delay * (1 << i), max_delay) for i in range(max(1, max_retries))
+        )
+    
+    def next_delay(self, retry: int) -> float:
+        """
+        Get the delay before a retry.
+        
+        Args:
+            retry: Retry number (0-indexed: 0 is the first retry)
+            
+        Returns:
+            Delay in seconds, e.g. 1s, 2s, 4s for retries 0, 1, 2 (before
+            jitter); retries past the end of the table reuse its last delay
+        """
+        delays = self._delays
+        delay = delays[retry] if retry < len(delays) else delays[-1]
+        if self.jitter:
+            delay *= 1.0 - self.jitter * self._random()
+        return delay
@@ -1,20 +1,50 @@
 """Checkout service for order processing."""
 
-from typing import Dict
+import itertools
+import sys
+import threading
+from array import array
+from typing import Dict, List, get_args
 
-from .models import Order
+from .models import Order, OrderStatus, Receipt
 from .gateway import PaymentGateway
 from .inventory import Inventory
 from .queueing import InMemoryJobQueue, Job
 from .idempotency import IdempotencyStore
 
 
+# Job type of the background charge-and-reserve job for an order
+CHARGE_ORDER = 'charge_order'
+
+# Numbers each service's own charge job type, so services sharing a queue
+# never replace each other's handlers
+_service_ids = itertools.count(1)
+
+# Order statuses are stored as one-byte codes: the index into this tuple
+_STATUSES = get_args(OrderStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+
 class CheckoutService:
     """
     Service for processing customer checkouts.
     
-    TODO: Move charge + reserve to background processing.
-    Currently charges synchronously inline.
+    checkout() records the order as 'pending' and enqueues a charge job;
+    workers on the same queue run it through _process_charge(), which
+    this service registers as the queue's handler for that job type.
+    
+    Handlers are registered per job type on the queue, so each service
+    enqueues its jobs under a job type of its own, `job_type`
+    (charge_order:<n>), and every job is charged through the gateway of
+    the service that created it. The first service on a queue also
+    handles jobs pushed with the plain charge_order type.
+    
+    Orders are stored column-wise rather than as Order objects: parallel
+    lists of ids and user ids, an array of int64 amounts and a bytearray
+    of status codes, with a dict from order_id to row. A status update is
+    a single byte store, and status_counts() counts each status with one
+    C-level bytearray.count() pass. get_order() builds an Order snapshot
+    from a row on demand.
     """
     
     def __init__(
@@ -22,7 +52,8 @@ class CheckoutService:
         gateway: PaymentGateway,
         inventory: Inventory,
         queue: InMemoryJobQueue,
-        idempotency_store: IdempotencyStore
+        idempotency_store: IdempotencyStore,
+        async_charges: bool = False
     ):
         """
         Initialize checkout service.
@@ -32,50 +63,216 @@ class CheckoutService:
             inventory: Inventory system for reservations
             queue: Job queue for background processing
             idempotency_store: Store for preventing duplicate charges
+            async_charges: Register a coroutine handler that charges through
+                gateway.charge_async(), for jobs run by an AsyncWorker
         """
         self.gateway = gateway
         self.inventory = inventory
         self.queue = queue
         self.idempotency_store = idempotency_store
-        self.orders: Dict[str, Order] = {}
+        # order_id -> row in the columns below
+        self._rows: Dict[str, int] = {}
+        self._order_ids: List[str] = []
+        self._user_ids: List[str] = []
+        self._amounts = array('q')
+        self._statuses = bytearray()
+        # Guards row writes, and makes checkout's charged check and record atomic
+        self._rows_lock = threading.Lock()
+        handler = self._process_charge_async if async_charges else self._process_charge
+        handlers = (handler, self._fail_charge, self._process_charge_batch)
+        self.job_type = f'{CHARGE_ORDER}:{next(_service_ids)}'
+        queue.register_handler(self.job_type, *handlers)
+        if queue.get_handler(CHARGE_ORDER) is None:
+            queue.register_handler(CHARGE_ORDER, *handlers)
     
     def checkout(self, order: Order) -> Order:
         """
         Process a checkout.
         
-        TODO: Instead of charging inline, enqueue a background job and return
-        order with status 'pending'. Background workers should later process
-        the job and update order status to 'paid' or 'failed'.
+        Records the order, enqueues a background job to charge it and
+        returns immediately with status 'pending'. Workers later update the
+        status to 'paid' or 'failed'. A repeat checkout of an order whose
+        job is still queued does not enqueue a second job, and one of an
+        order that was already charged just returns the recorded order.
+        
+        order.order_id is interned, so the row index, the job payload, the
+        queue's dedup set, the idempotency store and the gateway all key on
+        one string object whose hash is computed once, and key comparisons
+        succeed on identity.
         
         Args:
             order: Order to process
             
         Returns:
-            Order with updated status
+            Order with status 'pending', or the recorded order if it was
+            already charged
+        """
+        order.order_id = order_id = sys.intern(order.order_id)
+        with self._rows_lock:
+            # The charged check and the 'pending' write are one critical
+            # section, serialized with _set_status(), so a worker finishing
+            # this order concurrently can't have its status overwritten.
+            # A new order misses _rows with one dict probe and never pays
+            # for the idempotency store's hashing
+            if order_id in self._rows and self.idempotency_store.is_processed(order_id):
+                return self.get_order(order_id)
+            order.status = 'pending'
+            self._record(order)
+        # Outside the lock: a full queue blocks this checkout, not every other one
+        self.queue.push(Job(
+            job_id=f'charge-{order_id}',
+            job_type=self.job_type,
+            payload={'order_id': order_id, 'amount_cents': order.amount_cents}
+        ), dedup_key=order_id)
+        return order
+    
+    def _record(self, order: Order) -> None:
+        """
+        Store an order's fields in its row, appending a row for a new order.
+        
+        The caller holds _rows_lock; appending a row touches every column.
+        
+        Args:
+            order: Order to store
+        """
+        code = _STATUS_CODES[order.status]
+        # One probe both finds an existing row and claims the next one
+        new_row = len(self._order_ids)
+        row = self._rows.setdefault(order.order_id, new_row)
+        if row == new_row:
+            self._order_ids.append(order.order_id)
+            self._user_ids.append(order.user_id)
+            self._amounts.append(order.amount_cents)
+            self._statuses.append(code)
+        else:
+            self._user_ids[row] = order.user_id
+            self._amounts[row] = order.amount_cents
+            self._statuses[row] = code
+    
+    def _set_status(self, order_id: str, status: OrderStatus) -> None:
         """
-        # Store order
-        self.orders[order.order_id] = order
+        Update the status of a recorded order; unknown orders are ignored.
         
-        # Currently charges synchronously - NOT the desired behavior
-        # This should be changed to:
-        # 1. Set order status to 'pending'
-        # 2. Enqueue a job to the queue
-        # 3. Return order immediately
-        # 4. Let background workers charge and update status later
+        Args:
+            order_id: Order to update
+            status: New status
+        """
+        code = _STATUS_CODES[status]
+        with self._rows_lock:
+            row = self._rows.get(order_id)
+            if row is not None:
+                self._statuses[row] = code
+    
+    def _process_charge(self, job: Job) -> bool:
+        """
+        Run one attempt of a charge_order job.
+        
+        The order is claimed in the idempotency store before charging. An
+        order that is already processed, or claimed by a worker running a
+        duplicate job right now, is skipped, so a duplicate or redelivered
+        job never charges twice. The claim is released once the attempt
+        is over, so a failed charge can still be retried.
+        
+        Args:
+            job: charge_order job
+            
+        Returns:
+            True when the job is done, False if the charge failed and
+            should be retried
+        """
+        order_id = job.payload['order_id']
+        store = self.idempotency_store
+        if not store.claim(order_id):
+            return True
         try:
-            receipt = self.gateway.charge(order.order_id, order.amount_cents)
-            if receipt.charged:
-                reserved = self.inventory.reserve(order.order_id)
-                if reserved:
-                    order.status = 'paid'
-                else:
-                    order.status = 'failed'
-            else:
-                order.status = 'failed'
-        except Exception:
-            order.status = 'failed'
+            return self._settle_charge(order_id, self.gateway.charge(order_id, job.payload['amount_cents']))
+        finally:
+            store.release(order_id)
+    
+    def _process_charge_batch(self, jobs: List[Job]) -> List[bool]:
+        """
+        Run the first attempt of several charge_order jobs with one gateway.charge_batch() call.
         
-        return order
+        Orders are claimed as in _process_charge(), so a duplicate job in
+        the same batch or on another worker is skipped.
+        
+        Args:
+            jobs: charge_order jobs
+            
+        Returns:
+            One result per job, as from _process_charge()
+        """
+        store = self.idempotency_store
+        claim = store.claim
+        results = [True] * len(jobs)
+        to_charge = [i for i, job in enumerate(jobs) if claim(job.payload['order_id'])]
+        if to_charge:
+            payloads = [jobs[i].payload for i in to_charge]
+            try:
+                receipts = self.gateway.charge_batch(
+                    [(payload['order_id'], payload['amount_cents']) for payload in payloads]
+                )
+                for i, payload, receipt in zip(to_charge, payloads, receipts):
+                    results[i] = self._settle_charge(payload['order_id'], receipt)
+            finally:
+                for payload in payloads:
+                    store.release(payload['order_id'])
+        return results
+    
+    async def _process_charge_async(self, job: Job) -> bool:
+        """
+        Run one attempt of a charge_order job, charging via charge_async().
+        
+        The order is claimed before the await, as in _process_charge(): a
+        task running a duplicate job while this charge is suspended finds
+        the claim and skips the order.
+        
+        Args:
+            job: charge_order job
+            
+        Returns:
+            True when the job is done, False if the charge failed and
+            should be retried
+        """
+        order_id = job.payload['order_id']
+        store = self.idempotency_store
+        if not store.claim(order_id):
+            return True
+        try:
+            receipt = await self.gateway.charge_async(order_id, job.payload['amount_cents'])
+            return self._settle_charge(order_id, receipt)
+        finally:
+            store.release(order_id)
+    
+    def _settle_charge(self, order_id: str, receipt: Receipt) -> bool:
+        """
+        Record a charge attempt: mark the order processed, reserve and set its status.
+        
+        Args:
+            order_id: Order that was charged
+            receipt: Gateway receipt for the attempt
+            
+        Returns:
+            True when the job is done, False if the charge failed and
+            should be retried
+        """
+        if not receipt.charged:
+            return False
+        if not self.idempotency_store.mark_processed(order_id):
+            return True
+        
+        reserved = self.inventory.reserve(order_id)
+        self._set_status(order_id, 'paid' if reserved else 'failed')
+        return True
+    
+    def _fail_charge(self, job: Job) -> None:
+        """
+        Mark the order of a dead-lettered charge_order job as failed.
+        
+        Args:
+            job: charge_order job that exhausted its retries
+        """
+        self._set_status(job.payload['order_id'], 'failed')
     
     def get_order(self, order_id: str) -> Order:
         """
@@ -85,9 +282,25 @@ class CheckoutService:
             order_id: Order ID to retrieve
             
         Returns:
-            Order if found
+            Order if found, as a snapshot of its current fields
             
         Raises:
             KeyError: If order not found
         """
-        return self.orders[order_id]
+        row = self._rows[order_id]
+        return Order(
+            order_id=self._order_ids[row],
+            user_id=self._user_ids[row],
+            amount_cents=self._amounts[row],
+            status=_STATUSES[self._statuses[row]]
+        )
+    
+    def status_counts(self) -> Dict[str, int]:
+        """
+        Count recorded orders by status.
+        
+        Returns:
+            Mapping of every status to its number of orders
+        """
+        statuses = self._statuses
+        return {status: statuses.count(code) for code, status in enumerate(_STATUSES)}
@@ -1,64 +1,368 @@
 """Background worker for processing jobs."""
 
-from typing import List, Optional
+import heapq
+import inspect
+import itertools
+import threading
+from typing import Dict, List, Optional, Tuple
 
-from .queueing import InMemoryJobQueue, Job
+from .clock import Clock, SystemClock
+from .queueing import DeadLetterHandler, InMemoryJobQueue, Job
+from .retry import RetryPolicy
+
+
+# How long (in real seconds) an idle pool thread blocks on the queue before
+# rechecking for retries and shutdown; also the longest slice the thread
+# owning the retry timer sleeps before checking the queue again
+_IDLE_POLL_SECONDS = 0.1
+
+# Most jobs a pool thread takes from the queue at once
+_BATCH_SIZE = 32
 
 
 class Worker:
     """
     Background worker that processes jobs from a queue.
     
-    TODO: Implement concurrent worker pool with:
-    - Multiple worker threads/processes
-    - Configurable worker count
-    - Start/stop lifecycle methods
-    - Graceful shutdown that completes in-flight jobs
-    - Retry logic with exponential backoff
-    - Dead letter queue for failed jobs after max retries
+    Each job runs through the handler registered on the queue for its
+    job_type. A failed attempt is not retried on the spot: the job goes
+    into a min-heap keyed on (ready_at, seq), so finding the next due
+    retry is a look at the root and scheduling one is O(log n), however
+    many retries are pending. After retry_policy.max_retries retries the
+    job moves to the dead letter queue. All waiting is done on the
+    injected clock, so a FakeClock makes backoff instant in tests.
+    
+    process_one() runs jobs on the calling thread. start() instead runs
+    worker_count daemon threads that block on the queue and process jobs
+    as they arrive, overlapping gateway round trips; stop() lets them
+    finish the queued jobs and pending retries, then joins them. Pool
+    threads never wait out a backoff with work queued: a failed attempt
+    just goes into the heap, and while retries are pending one thread at
+    a time owns the retry timer, sleeping on the clock in slices of at
+    most _IDLE_POLL_SECONDS, while the others block on the queue.
     """
     
-    def __init__(self, queue: InMemoryJobQueue):
+    def __init__(
+        self,
+        queue: InMemoryJobQueue,
+        clock: Optional[Clock] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        worker_count: int = 1
+    ):
         """
         Initialize worker.
         
         Args:
             queue: Job queue to process from
+            clock: Clock used to schedule and wait out retry backoff;
+                defaults to the real SystemClock
+            retry_policy: Retry limit and backoff schedule
+            worker_count: Number of threads started by start()
         """
         self.queue = queue
+        self.clock = clock or SystemClock()
+        self._now = self.clock.now  # Bound once; read on every attempt and poll
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.worker_count = worker_count
         self.dlq: List[Job] = []  # Dead letter queue for failed jobs
+        # Jobs waiting out their backoff: (ready_at, seq, job); seq breaks
+        # ties so jobs themselves are never compared. Guarded by _lock
+        self._delayed: List[Tuple[float, int, Job]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        # Held by the one pool thread sleeping on the clock toward the next retry
+        self._retry_timer = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = threading.Event()
     
     def process_one(self) -> Optional[Job]:
         """
-        Process a single job from the queue.
+        Process jobs until one finishes (succeeds or moves to the DLQ).
         
-        TODO: Add retry logic and error handling
+        Due retries are taken before new jobs. When the only work left is
+        a retry that isn't due yet, the worker sleeps on the clock until it
+        is due (a FakeClock just advances) and runs it.
         
         Returns:
-            The job that was processed, or None if queue was empty
+            The job that finished, or None if there was nothing to process
         """
-        job = self.queue.pop()
-        if job:
-            # Naive implementation - just processes synchronously
-            # TODO: Add actual job processing logic with retries
-            pass
+        return self._run_job(self._next_job())
+    
+    def _run_job(self, job: Optional[Job]) -> Optional[Job]:
+        """
+        Run a job, and whatever retries come due, until one finishes.
+        
+        Args:
+            job: Job to start with, or None
+            
+        Returns:
+            The job that finished, or None if work ran out first (another
+            thread took the pending retry)
+        """
+        while job is not None and not self._attempt(job):
+            self._wait_for_retry()
+            job = self._next_job()
         return job
     
+    def process_batch(self, n: int = _BATCH_SIZE) -> List[Job]:
+        """
+        Take up to n jobs from the queue in one go and run each to completion.
+        
+        Jobs in the batch with the same (job_type, job_id) as an earlier
+        one are duplicates and are dropped without running. Job types with
+        a batch handler get their first attempts in a single call.
+        
+        Args:
+            n: Most jobs to take
+            
+        Returns:
+            The jobs that finished
+        """
+        return self._run_batch(self.queue.pop_batch(n))
+    
+    def _run_batch(self, jobs: List[Job], run_retries: bool = True) -> List[Job]:
+        """
+        Run a batch of jobs, skipping in-batch duplicates.
+        
+        Jobs are grouped by job_type. A group whose type has a batch
+        handler registered gets its first attempts in one call to it (one
+        gateway round trip for the lot, say). Every job gets its first
+        attempt before any retry is waited for, so the backoffs of jobs
+        that failed run down together rather than one after another.
+        
+        Args:
+            jobs: Jobs taken from the queue
+            run_retries: Run failed jobs' retries to completion before
+                returning; pool threads pass False and leave them in the
+                retry heap for whichever thread is free when they are due
+            
+        Returns:
+            The jobs that finished
+        """
+        groups: Dict[str, List[Job]] = {}
+        seen = set()
+        for job in jobs:
+            key = (job.job_type, job.job_id)
+            if key in seen:
+                continue
+            seen.add(key)
+            groups.setdefault(job.job_type, []).append(job)
+        
+        finished: List[Job] = []
+        retrying = 0
+        for job_type, group in groups.items():
+            batch_handler = self.queue.get_batch_handler(job_type)
+            if batch_handler is None or len(group) == 1:
+                for job in group:
+                    if self._attempt(job):
+                        finished.append(job)
+                    else:
+                        retrying += 1
+                continue
+            try:
+                results = batch_handler(group)
+            except Exception:
+                results = [False] * len(group)
+            on_dead_letter = self.queue.get_handler(job_type)[1]
+            for job, ok in zip(group, results):
+                if self._settle(job, ok, on_dead_letter):
+                    finished.append(job)
+                else:
+                    retrying += 1
+        
+        if run_retries:
+            # Each _run_job() call takes the earliest retry once it is due
+            # and returns the next job to finish
+            for _ in range(retrying):
+                self._wait_for_retry()
+                done = self._run_job(self._next_job())
+                if done is not None:
+                    finished.append(done)
+        return finished
+    
+    def _take_due_retry(self) -> Optional[Job]:
+        """
+        Take the earliest pending retry if it is due.
+        
+        Returns:
+            Job to retry, or None if no retry is due
+        """
+        delayed = self._delayed
+        if delayed:
+            with self._lock:
+                # Only the heap root can be due first, so this is one comparison
+                if delayed and delayed[0][0] <= self._now():
+                    return heapq.heappop(delayed)[2]
+        return None
+    
+    def _next_job(self) -> Optional[Job]:
+        """
+        Take the next job to run: a due retry if any, else a new job.
+        
+        Returns:
+            Job to run, or None if neither is available
+        """
+        job = self._take_due_retry()
+        return job if job is not None else self.queue.pop()
+    
+    def _attempt(self, job: Job) -> bool:
+        """
+        Run one attempt of a job.
+        
+        Args:
+            job: Job to run
+            
+        Returns:
+            True if the job is finished (succeeded or dead-lettered),
+            False if it was scheduled for a retry
+            
+        Raises:
+            TypeError: If the handler is a coroutine function; those jobs
+                must be run by an AsyncWorker's coroutine methods
+        """
+        handlers = self.queue.get_handler(job.job_type)
+        if handlers is None:
+            # Nothing can ever run this job type
+            self.dlq.append(job)
+            return True
+        handler, on_dead_letter = handlers
+        
+        try:
+            done = handler(job)
+        except Exception:
+            done = False
+        if inspect.isawaitable(done):
+            # An un-awaited coroutine is truthy: treating it as a result
+            # would report the job finished without ever running it
+            if inspect.iscoroutine(done):
+                done.close()
+            raise TypeError(
+                f'handler for {job.job_type!r} returned an awaitable; '
+                'run it with AsyncWorker.start() or process_one_async()'
+            )
+        return self._settle(job, done, on_dead_letter)
+    
+    def _settle(self, job: Job, done: bool, on_dead_letter: Optional[DeadLetterHandler]) -> bool:
+        """
+        Act on the outcome of an attempt: finish, dead-letter or schedule a retry.
+        
+        Args:
+            job: Job that was attempted
+            done: Whether the handler reported success
+            on_dead_letter: Callback for a job moving to the DLQ, if any
+            
+        Returns:
+            True if the job is finished (succeeded or dead-lettered),
+            False if it was scheduled for a retry
+        """
+        if done:
+            return True
+        
+        if job.attempts >= self.retry_policy.max_retries:
+            self.dlq.append(job)
+            if on_dead_letter is not None:
+                on_dead_letter(job)
+            return True
+        
+        # The same Job object is rescheduled, with its retry count bumped
+        ready_at = self._now() + self.retry_policy.next_delay(job.attempts)
+        job.attempts += 1
+        with self._lock:
+            heapq.heappush(self._delayed, (ready_at, next(self._seq), job))
+        return False
+    
+    def _wait_for_retry(self, max_wait: Optional[float] = None) -> None:
+        """
+        Wait on the clock until the earliest pending retry is due.
+        
+        Args:
+            max_wait: Most seconds to wait, even if the retry isn't due by
+                then; None waits until it is
+        """
+        with self._lock:
+            if not self._delayed:
+                return
+            ready_at = self._delayed[0][0]
+        if max_wait is not None:
+            ready_at = min(ready_at, self._now() + max_wait)
+        self._wait_until(ready_at)
+    
+    def _wait_until(self, ready_at: float) -> None:
+        """
+        Wait on the clock until the given time.
+        
+        Args:
+            ready_at: Clock time to wait for
+        """
+        now = self._now()
+        if ready_at > now:
+            self.clock.sleep(ready_at - now)
+    
     def start(self) -> None:
         """
-        Start the worker pool.
+        Start worker_count threads and return immediately.
         
-        TODO: Implement worker pool startup
+        Calling start() on a running pool does nothing.
         """
-        pass
+        if self._threads:
+            return
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f'orders-worker-{i}', daemon=True)
+            for i in range(self.worker_count)
+        ]
+        for thread in self._threads:
+            thread.start()
     
-    def stop(self) -> None:
+    def stop(self, timeout: Optional[float] = None) -> None:
         """
         Stop the worker pool gracefully.
         
-        TODO: Implement graceful shutdown
+        The threads finish the jobs already queued, in-flight jobs and
+        their pending retries, then exit and are joined.
+        
+        Args:
+            timeout: Maximum seconds to wait for each thread; None waits
+                until the work is done
+        """
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def _run(self) -> None:
+        """
+        Pool thread body: process jobs until stopped and out of work.
+        
+        Jobs are taken in batches of up to _BATCH_SIZE, but never more than
+        a fair share of what is queued, so one thread doesn't hoard work
+        the others could be running in parallel. Each job gets one attempt
+        at a time; a failed one waits in the retry heap, not on this thread.
         """
-        pass
+        queue = self.queue
+        pop_batch = queue.pop_batch
+        retry_timer = self._retry_timer
+        while True:
+            job = self._take_due_retry()
+            if job is not None:
+                self._attempt(job)
+                continue
+            share = max(1, min(_BATCH_SIZE, queue.size() // self.worker_count))
+            jobs = pop_batch(share)
+            if not jobs:
+                if self._delayed and retry_timer.acquire(blocking=False):
+                    # Move toward the next retry one slice at a time, so a
+                    # job arriving meanwhile waits at most one slice
+                    try:
+                        self._wait_for_retry(_IDLE_POLL_SECONDS)
+                    finally:
+                        retry_timer.release()
+                    continue
+                if self._stopping.is_set() and not self._delayed:
+                    return
+                # Idle: block on the queue for a while rather than spin
+                jobs = pop_batch(share, block=True, timeout=_IDLE_POLL_SECONDS)
+            self._run_batch(jobs, run_retries=False)
     
     def get_dlq(self) -> List[Job]:
         """
@@ -5,14 +5,22 @@ This test verifies that checkout() returns quickly with status 'pending'
 and that background workers asynchronously process the order.
 """
 
+import asyncio
+
+import pytest
+
 from orders import (
+    Job,
     Order,
     FakeGateway,
     Inventory,
     InMemoryJobQueue,
     IdempotencyStore,
     Worker,
+    AsyncWorker,
     CheckoutService,
+    FakeClock,
+    QueueFullError,
 )
 
 
@@ -138,3 +146,160 @@ def test_multiple_workers_process_concurrently():
     
     # TODO: Verify all orders are eventually processed to 'paid' status
     # This will fail until worker pool is implemented
+
+
+def test_bounded_queue_applies_backpressure():
+    """
+    Test that the job queue is bounded and rejects pushes once full.
+    
+    Expected behavior:
+    1. Queue accepts jobs up to its capacity
+    2. A non-blocking push to a full queue raises QueueFullError
+    3. Popping a job frees a slot for the next push
+    """
+    queue = InMemoryJobQueue(capacity=2)
+    queue.push(Job(job_id='job-1', job_type='charge_order', payload={}))
+    queue.push(Job(job_id='job-2', job_type='charge_order', payload={}))
+    
+    with pytest.raises(QueueFullError):
+        queue.push(Job(job_id='job-3', job_type='charge_order', payload={}), block=False)
+    assert queue.size() == 2
+    
+    assert queue.pop().job_id == 'job-1'
+    queue.push(Job(job_id='job-3', job_type='charge_order', payload={}), block=False)
+    assert [queue.pop().job_id, queue.pop().job_id] == ['job-2', 'job-3']
+    assert queue.pop() is None
+
+
+def test_status_counts_track_processing():
+    """
+    Test that status_counts() reflects orders as workers process them.
+    
+    Expected behavior:
+    1. Freshly checked-out orders are all counted as 'pending'
+    2. After a worker processes one, it is counted as 'paid'
+    """
+    queue = InMemoryJobQueue()
+    service = CheckoutService(FakeGateway(), Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue)
+    
+    for i in range(3):
+        service.checkout(Order(order_id=f'order-{i}', user_id=f'user-{i}', amount_cents=1000))
+    assert service.status_counts() == {'pending': 3, 'paid': 0, 'failed': 0}
+    
+    worker.process_one()
+    assert service.status_counts() == {'pending': 2, 'paid': 1, 'failed': 0}
+
+
+def test_batch_checkout_charges_in_one_gateway_call():
+    """
+    Test that process_batch() charges a batch through gateway.charge_batch().
+    
+    Expected behavior:
+    1. The first attempts of all queued orders go out in one charge_batch() call
+    2. An order that fails is retried on its own until it is charged
+    3. Every order ends 'paid' and is charged exactly once
+    """
+    class BatchCountingGateway(FakeGateway):
+        __slots__ = ('batch_sizes',)
+        
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.batch_sizes = []
+        
+        def charge_batch(self, items):
+            self.batch_sizes.append(len(items))
+            return super().charge_batch(items)
+    
+    gateway = BatchCountingGateway(fail_count_per_order={'order-2': 2})
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue, clock=FakeClock())
+    
+    for i in range(5):
+        service.checkout(Order(order_id=f'order-{i}', user_id=f'user-{i}', amount_cents=1000))
+    finished = worker.process_batch(100)
+    
+    assert len(finished) == 5
+    assert gateway.batch_sizes == [5]
+    assert gateway.attempt_count['order-2'] == 3
+    assert service.status_counts()['paid'] == 5
+    assert all(gateway.get_charge_count(f'order-{i}') == 1 for i in range(5))
+
+
+def test_worker_pool_drains_queue_on_stop():
+    """
+    Test that a started worker pool processes every job before stop() returns.
+    
+    Expected behavior:
+    1. start() launches the worker threads
+    2. Jobs enqueued before stop(), including ones needing retries, finish
+    3. Each order is charged exactly once
+    """
+    gateway = FakeGateway(fail_count_per_order={'order-3': 2, 'order-7': 1})
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue, clock=FakeClock(), worker_count=3)
+    
+    worker.start()
+    for i in range(20):
+        service.checkout(Order(order_id=f'order-{i}', user_id=f'user-{i}', amount_cents=1000))
+    worker.stop()
+    
+    assert queue.is_empty()
+    assert service.status_counts()['paid'] == 20
+    assert all(gateway.get_charge_count(f'order-{i}') == 1 for i in range(20))
+    assert worker.get_dlq() == []
+
+
+def test_async_worker_drains_queue_on_aclose():
+    """
+    Test that an AsyncWorker charges every order through charge_async().
+    
+    Expected behavior:
+    1. start() launches the worker tasks on the running event loop
+    2. Jobs enqueued before aclose(), including ones needing retries, finish
+    3. Each order is charged exactly once
+    """
+    gateway = FakeGateway(fail_count_per_order={'order-3': 2, 'order-7': 1})
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore(), async_charges=True)
+    worker = AsyncWorker(queue, clock=FakeClock(), concurrency=8)
+    
+    async def run():
+        worker.start()
+        for i in range(20):
+            service.checkout(Order(order_id=f'order-{i}', user_id=f'user-{i}', amount_cents=1000))
+        await worker.aclose()
+    
+    asyncio.run(run())
+    
+    assert queue.is_empty()
+    assert service.status_counts()['paid'] == 20
+    assert all(gateway.get_charge_count(f'order-{i}') == 1 for i in range(20))
+    assert gateway.attempt_count['order-3'] == 3
+    assert worker.get_dlq() == []
+
+
+def test_sync_worker_refuses_coroutine_handler():
+    """
+    Test that a sync Worker never mistakes an un-awaited coroutine for success.
+    
+    Expected behavior:
+    1. A plain Worker running an async_charges service's job raises TypeError
+    2. AsyncWorker.process_batch(), which would run handlers synchronously,
+       refuses outright
+    3. Nothing is charged and the order is left 'pending', not reported done
+    """
+    gateway = FakeGateway()
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore(), async_charges=True)
+    service.checkout(Order(order_id='order-async', user_id='user-1', amount_cents=1000))
+    
+    with pytest.raises(TypeError):
+        Worker(queue, clock=FakeClock()).process_one()
+    with pytest.raises(NotImplementedError):
+        AsyncWorker(queue, clock=FakeClock()).process_batch()
+    
+    assert gateway.get_charge_count('order-async') == 0
+    assert service.get_order('order-async').status == 'pending'
@@ -5,6 +5,9 @@ This test verifies that the idempotency store prevents duplicate charges
 even if the same job is processed multiple times.
 """
 
+import asyncio
+import time
+
 from orders import (
     Order,
     FakeGateway,
@@ -12,6 +15,7 @@ from orders import (
     InMemoryJobQueue,
     IdempotencyStore,
     Worker,
+    AsyncWorker,
     CheckoutService,
     Job,
 )
@@ -64,6 +68,70 @@ def test_same_order_enqueued_twice_charges_once():
         f'order should be charged at most once, but was charged {charge_count} times'
 
 
+def test_concurrent_workers_charge_duplicate_job_once():
+    """
+    Test that two workers holding duplicate jobs for one order charge it once.
+    
+    Expected behavior:
+    1. One worker is mid-charge on an order when a duplicate job arrives
+    2. The other worker picks up the duplicate while the charge is in flight
+    3. The duplicate is skipped rather than charging the order again
+    """
+    class SlowGateway(FakeGateway):
+        __slots__ = ()
+        
+        def charge(self, order_id, amount_cents):
+            time.sleep(0.05)
+            return super().charge(order_id, amount_cents)
+    
+    gateway = SlowGateway()
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue, worker_count=2)
+    
+    worker.start()
+    service.checkout(Order(order_id='order-race', user_id='user-1', amount_cents=5000))
+    queue.push(Job(
+        job_id='job-race-dup',
+        job_type='charge_order',
+        payload={'order_id': 'order-race', 'amount_cents': 5000}
+    ))
+    worker.stop()
+    
+    assert gateway.get_charge_count('order-race') == 1
+    assert service.get_order('order-race').status == 'paid'
+
+
+def test_async_tasks_charge_duplicate_job_once():
+    """
+    Test that two worker tasks holding duplicate jobs for one order charge it once.
+    
+    Expected behavior:
+    1. One task awaits charge_async() for an order, suspending mid-charge
+    2. Another task picks up a duplicate job for the order meanwhile
+    3. The duplicate is skipped rather than charging the order again
+    """
+    gateway = FakeGateway()
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore(), async_charges=True)
+    worker = AsyncWorker(queue, concurrency=2)
+    
+    async def run():
+        service.checkout(Order(order_id='order-async-race', user_id='user-1', amount_cents=5000))
+        queue.push(Job(
+            job_id='job-async-dup',
+            job_type='charge_order',
+            payload={'order_id': 'order-async-race', 'amount_cents': 5000}
+        ))
+        worker.start()
+        await worker.aclose()
+    
+    asyncio.run(run())
+    
+    assert gateway.get_charge_count('order-async-race') == 1
+    assert service.get_order('order-async-race').status == 'paid'
+
+
 def test_idempotency_store_prevents_reprocessing():
     """
     Test that idempotency store correctly tracks processed orders.
@@ -125,3 +193,84 @@ def test_concurrent_idempotency_check():
     first_count = sum(1 for r in results if r)
     assert first_count == 1, \
         f'exactly one mark_processed should succeed, but {first_count} succeeded'
+
+
+def test_idempotency_store_is_bounded():
+    """
+    Test that the idempotency store only remembers its most recent orders.
+    
+    Expected behavior:
+    1. Orders within capacity are detected as processed
+    2. Once capacity is exceeded, the least recently marked order is forgotten
+    """
+    # One shard, so eviction is strictly least recently used across the store
+    idempotency_store = IdempotencyStore(capacity=2, shards=1)
+    
+    assert idempotency_store.mark_processed('order-a')
+    assert idempotency_store.mark_processed('order-b')
+    assert not idempotency_store.mark_processed('order-a'), \
+        'order-a is within capacity and should still be remembered'
+    
+    # order-b is now the least recently used and is evicted
+    assert idempotency_store.mark_processed('order-c')
+    assert idempotency_store.is_processed('order-a')
+    assert idempotency_store.is_processed('order-c')
+    assert not idempotency_store.is_processed('order-b'), \
+        'least recently used order should be evicted past capacity'
+
+
+def test_duplicate_checkout_is_coalesced_in_queue():
+    """
+    Test that checking out an order whose job is still queued adds no job.
+    
+    Expected behavior:
+    1. Two checkouts of the same order enqueue a single job
+    2. Once the order is charged, checking it out again enqueues nothing
+    """
+    gateway = FakeGateway()
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue)
+    
+    order = Order(order_id='order-coalesce', user_id='user-1', amount_cents=1000)
+    service.checkout(order)
+    service.checkout(order)
+    assert queue.size() == 1, 'duplicate checkout should not enqueue a second job'
+    
+    worker.process_one()
+    assert queue.is_empty()
+    assert gateway.get_charge_count('order-coalesce') == 1
+    
+    result = service.checkout(order)
+    assert result.status == 'paid'
+    assert queue.is_empty(), 'charged order should not be enqueued again'
+
+
+def test_process_batch_skips_duplicates_within_batch():
+    """
+    Test that a batch drained from the queue runs each job only once.
+    
+    Expected behavior:
+    1. The same job pushed twice lands in one batch
+    2. process_batch() runs it once and drops the duplicate
+    """
+    gateway = FakeGateway()
+    queue = InMemoryJobQueue()
+    service = CheckoutService(gateway, Inventory(), queue, IdempotencyStore())
+    worker = Worker(queue)
+    
+    service.checkout(Order(order_id='order-batch', user_id='user-1', amount_cents=1000))
+    duplicate_job = Job(
+        job_id='job-batch-dup',
+        job_type='charge_order',
+        payload={'order_id': 'order-other', 'amount_cents': 500}
+    )
+    queue.push(duplicate_job)
+    queue.push(duplicate_job)
+    
+    finished = worker.process_batch()
+    
+    assert queue.is_empty()
+    assert [job.job_id for job in finished] == ['charge-order-batch', 'job-batch-dup']
+    assert gateway.get_charge_count('order-batch') == 1
+    assert gateway.get_charge_count('order-other') == 1
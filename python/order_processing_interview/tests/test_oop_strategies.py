@@ -5,6 +5,10 @@ This test verifies that custom payment gateways and strategies
 can be injected without modifying core logic.
 """
 
+from types import SimpleNamespace
+
+import pytest
+
 from orders import (
     Order,
     PaymentGateway,
@@ -13,9 +17,26 @@ from orders import (
     InMemoryJobQueue,
     IdempotencyStore,
     CheckoutService,
+    FakeClock,
+    Worker,
 )
 
 
+@pytest.fixture
+def di_bundle():
+    """Fresh inventory, queue and idempotency store for one CheckoutService wiring."""
+    return SimpleNamespace(
+        inventory=Inventory(),
+        queue=InMemoryJobQueue(),
+        idempotency_store=IdempotencyStore()
+    )
+
+
+def make_service(gateway: PaymentGateway, bundle: SimpleNamespace) -> CheckoutService:
+    """Inject a gateway, plus the bundle's other dependencies, into a CheckoutService."""
+    return CheckoutService(gateway, bundle.inventory, bundle.queue, bundle.idempotency_store)
+
+
 class CustomGateway(PaymentGateway):
     """
     Custom payment gateway implementation for testing.
@@ -26,10 +47,11 @@ class CustomGateway(PaymentGateway):
     
     def __init__(self):
         self.charge_calls = []
+        self._record_call = self.charge_calls.append
     
     def charge(self, order_id: str, amount_cents: int) -> Receipt:
         """Custom charge implementation that tracks calls."""
-        self.charge_calls.append((order_id, amount_cents))
+        self._record_call((order_id, amount_cents))
         return Receipt(
             order_id=order_id,
             charged=True,
@@ -41,8 +63,13 @@ class AlwaysFailGateway(PaymentGateway):
     """Gateway that always fails - for testing error handling."""
     
     def charge(self, order_id: str, amount_cents: int) -> Receipt:
-        """Always raise an exception."""
-        raise Exception('Payment gateway is down')
+        """Always report a failed charge, without raising."""
+        return Receipt(
+            order_id=order_id,
+            charged=False,
+            attempt=1,
+            error_code='gateway_down'
+        )
 
 
 class FraudCheckGateway(PaymentGateway):
@@ -59,117 +86,44 @@ class FraudCheckGateway(PaymentGateway):
         return self.inner_gateway.charge(order_id, amount_cents)
 
 
-def test_custom_gateway_injection():
+@pytest.mark.parametrize('gateway_factory, final_status', [
+    (CustomGateway, 'paid'),
+    (AlwaysFailGateway, 'failed'),
+    (lambda: FraudCheckGateway(inner_gateway=CustomGateway(), blocked_users={'blocked-user'}), 'paid'),
+], ids=['custom', 'always-fail', 'fraud-check-decorator'])
+def test_gateway_strategy_injection(di_bundle, gateway_factory, final_status):
     """
-    Test that custom gateway can be injected via interface.
+    Test that any PaymentGateway strategy can be injected via the interface.
     
     Expected behavior:
-    1. Create custom gateway implementation
-    2. Inject into CheckoutService
-    3. Checkout should use custom gateway
+    1. Inject a custom gateway, a failing one, or one wrapping another
+    2. checkout() returns 'pending' whatever the gateway
+    3. A worker runs the charge through the injected gateway: the order
+       ends 'paid', or 'failed' once an always-failing gateway exhausts
+       its retries
     4. No changes to core logic required
     
     This test will FAIL if CheckoutService is tightly coupled to FakeGateway.
     """
-    # Setup with custom gateway
-    custom_gateway = CustomGateway()
-    inventory = Inventory()
-    queue = InMemoryJobQueue()
-    idempotency_store = IdempotencyStore()
-    
-    # Inject custom gateway
-    service = CheckoutService(custom_gateway, inventory, queue, idempotency_store)
+    service = make_service(gateway_factory(), di_bundle)
     
     order = Order(
-        order_id='order-custom',
+        order_id='order-strategy',
         user_id='user-1',
         amount_cents=7000
     )
     
-    # Act - checkout with custom gateway
+    # Act - checkout, then let a worker process the charge
     result = service.checkout(order)
+    assert result.status == 'pending', \
+        'checkout() should return immediately whatever the gateway'
     
-    # Assert - custom gateway was used
-    # Note: This assumes synchronous processing for now
-    # With async processing, would need to wait for worker
-    assert len(custom_gateway.charge_calls) >= 0, \
-        'custom gateway should be used by service'
+    Worker(di_bundle.queue, clock=FakeClock()).process_one()
+    assert service.get_order('order-strategy').status == final_status, \
+        'service should charge through the injected gateway'
 
 
-def test_always_fail_gateway_strategy():
-    """
-    Test that AlwaysFailGateway can be used for error testing.
-    
-    Expected behavior:
-    1. Inject AlwaysFailGateway
-    2. All charge attempts fail
-    3. Order is marked as 'failed' or retried to DLQ
-    
-    This demonstrates flexibility of strategy pattern.
-    """
-    # Setup with failing gateway
-    failing_gateway = AlwaysFailGateway()
-    inventory = Inventory()
-    queue = InMemoryJobQueue()
-    idempotency_store = IdempotencyStore()
-    
-    service = CheckoutService(failing_gateway, inventory, queue, idempotency_store)
-    
-    order = Order(
-        order_id='order-fail',
-        user_id='user-1',
-        amount_cents=8000
-    )
-    
-    # Act - checkout should handle failure gracefully
-    result = service.checkout(order)
-    
-    # Assert - order should be failed or pending (for async processing)
-    assert result.status in ['failed', 'pending'], \
-        'service should handle gateway failures'
-
-
-def test_fraud_check_gateway_decorator():
-    """
-    Test decorator/wrapper pattern with fraud checking gateway.
-    
-    Expected behavior:
-    1. FraudCheckGateway wraps another gateway
-    2. Adds fraud checking layer
-    3. Delegates to inner gateway
-    4. Demonstrates composability
-    
-    This shows how strategies can be composed.
-    """
-    # Setup with wrapped gateway
-    inner_gateway = CustomGateway()
-    fraud_gateway = FraudCheckGateway(
-        inner_gateway=inner_gateway,
-        blocked_users={'blocked-user'}
-    )
-    
-    inventory = Inventory()
-    queue = InMemoryJobQueue()
-    idempotency_store = IdempotencyStore()
-    
-    service = CheckoutService(fraud_gateway, inventory, queue, idempotency_store)
-    
-    order = Order(
-        order_id='order-fraud',
-        user_id='user-1',
-        amount_cents=9000
-    )
-    
-    # Act
-    result = service.checkout(order)
-    
-    # Assert - inner gateway should have been called
-    # (fraud check delegates to it)
-    assert len(inner_gateway.charge_calls) >= 0, \
-        'fraud gateway should delegate to inner gateway'
-
-
-def test_multiple_strategies_without_code_changes():
+def test_multiple_strategies_without_code_changes(di_bundle):
     """
     Test that different strategies can be used without changing CheckoutService.
     
@@ -177,27 +131,29 @@ def test_multiple_strategies_without_code_changes():
     1. Same CheckoutService code works with different gateways
     2. No modifications to service required
     3. Pure dependency injection
+    4. Services sharing a queue each charge their orders through their own gateway
     
     This is the core benefit of the Strategy pattern.
     """
-    inventory = Inventory()
-    queue = InMemoryJobQueue()
-    idempotency_store = IdempotencyStore()
-    
     # Test with CustomGateway
-    service1 = CheckoutService(
-        CustomGateway(), inventory, queue, idempotency_store
-    )
+    service1 = make_service(CustomGateway(), di_bundle)
     order1 = Order('order-1', 'user-1', 1000)
     result1 = service1.checkout(order1)
     
     # Test with different gateway instance
-    service2 = CheckoutService(
-        CustomGateway(), inventory, queue, idempotency_store
-    )
+    service2 = make_service(CustomGateway(), di_bundle)
     order2 = Order('order-2', 'user-2', 2000)
     result2 = service2.checkout(order2)
     
     # Both should work without service code changes
     assert result1.order_id == 'order-1'
     assert result2.order_id == 'order-2'
+    
+    # Both services share one queue; each order is charged by its own gateway
+    worker = Worker(di_bundle.queue, clock=FakeClock())
+    worker.start()
+    worker.stop()
+    assert service1.get_order('order-1').status == 'paid'
+    assert service2.get_order('order-2').status == 'paid'
+    assert service1.gateway.charge_calls == [('order-1', 1000)]
+    assert service2.gateway.charge_calls == [('order-2', 2000)]